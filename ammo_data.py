@@ -1,8 +1,9 @@
-from typing import Dict, Union
+from types import MappingProxyType
+from typing import Dict, Mapping, Union
 
 # Dictionary storing ammo data in format: {ammo_name: (category, damage, penetration)}
 # For buckshot, damage is stored as "8x37" to represent 8 pellets of 37 damage each
-AMMO_DATA: Dict[str, tuple[str, Union[str, int], int]] = {
+_AMMO_DATA_RAW: Dict[str, tuple[str, Union[str, int], int]] = {
     # 12 Gauge Shot
     "5.25MM BUCKSHOT": ("12 Gauge Shot", "8x37", 1),
     "8.5MM MAGNUM BUCKSHOT": ("12 Gauge Shot", "8x50", 2),
@@ -227,3 +228,6 @@ AMMO_DATA: Dict[str, tuple[str, Union[str, int], int]] = {
     # Other
     "40MM BUCKSHOT GRENADE": ("Other", 160, 5)
 }
+
+# Public read-only view; the table is static, so callers must not mutate it
+AMMO_DATA: Mapping[str, tuple[str, Union[str, int], int]] = MappingProxyType(_AMMO_DATA_RAW)
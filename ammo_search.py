@@ -1,67 +1,143 @@
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+import asyncio
+import bisect
+import functools
 import aiohttp
 from datetime import datetime, timezone as tz
 import os
 import json
 import discord
 
-# Optional fuzzy match: prefer fuzzywuzzy if installed; fallback to difflib
+# Optional fuzzy match: prefer RapidFuzz if installed; fallback to difflib
 try:
-    from fuzzywuzzy import process as fw_process  # type: ignore
+    from rapidfuzz import fuzz, process as rf_process, utils as rf_utils  # type: ignore
 except Exception:  # ModuleNotFoundError or others
-    fw_process = None
+    rf_process = None
     import difflib
 
+# Prefer orjson if installed; fallback to stdlib json
+try:
+    import orjson  # type: ignore
+except Exception:  # ModuleNotFoundError or others
+    orjson = None
+
+# Both accept bytes, so response bodies and cache files skip a str decode
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# GraphQL request, serialized once at import; each refresh posts the same bytes
+_GRAPHQL_URL = "https://api.tarkov.dev/graphql"
+_AMMO_QUERY = """
+query MyQuery {
+  ammo {
+    item {
+      name
+      normalizedName
+      shortName
+    }
+    ammoType
+    armorDamage
+    caliber
+    damage
+    penetrationChance
+    penetrationPower
+    projectileCount
+    tracer
+    tracerColor
+  }
+}
+"""
+_AMMO_BODY = (
+    orjson.dumps({"query": _AMMO_QUERY})
+    if orjson is not None
+    else json.dumps({"query": _AMMO_QUERY}).encode("utf-8")
+)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 # Cache configuration (mirrors price_search.py approach)
 CACHE_FILE = os.path.join(os.path.dirname(__file__), "ammo_cache.json")
 CACHE_TTL_SECONDS = 600  # 10 minutes
 
+# Last parsed cache file as (mtime, result), so fresh hits skip the disk read and JSON parse
+_MEM_CACHE: Optional[Tuple[float, Dict[str, Any]]] = None
+
+# Match pool for the current ammo payload, keyed by its fetchedAt stamp
+_POOL_CACHE: Dict[str, "_MatchPool"] = {}
+
+# Shared HTTP session for GraphQL refreshes, created lazily so keep-alive sockets are reused
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+# Shortest query that may resolve by prefix/substring instead of fuzzy scoring
+_MIN_PARTIAL_LEN = 3
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Return the shared session, (re)creating it if missing or closed."""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        # Same timeouts as the bot's session, so a stalled request can't hang a refresh
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=120, sock_connect=10),
+        )
+    return _SESSION
+
 
-async def fetch_ammo_data() -> Optional[Dict[str, Any]]:
+async def close_session() -> None:
+    """Close the shared session; call on bot shutdown."""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+
+def _read_cache_file() -> Dict[str, Any]:
+    with open(CACHE_FILE, "rb") as f:
+        raw = f.read()
+    return _json_loads(raw)
+
+
+def _write_cache_file(result: Dict[str, Any]) -> None:
+    if orjson is not None:
+        raw = orjson.dumps(result)
+    else:
+        raw = json.dumps(result, ensure_ascii=False).encode("utf-8")
+    with open(CACHE_FILE, "wb") as f:
+        f.write(raw)
+
+
+async def fetch_ammo_data(session: Optional[aiohttp.ClientSession] = None) -> Optional[Dict[str, Any]]:
     """Fetch ammo from GraphQL API with on-disk caching.
 
+    Pass the bot's shared `session` to reuse its pool; otherwise a module-level one is used.
+
     Returns a dict: { "ammo": [...], "fetchedAt": iso_string }
     """
-    # 1) Serve fresh cache when available
+    global _MEM_CACHE
+
+    # 1) Serve fresh cache when available (from memory if the file is unchanged)
     try:
         if os.path.exists(CACHE_FILE):
             mtime = os.path.getmtime(CACHE_FILE)
             if (datetime.now(tz.utc).timestamp() - mtime) < CACHE_TTL_SECONDS:
-                with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                if _MEM_CACHE is not None and _MEM_CACHE[0] == mtime:
+                    return _MEM_CACHE[1]
+                # File I/O runs in a worker thread so the event loop isn't blocked
+                cached = await asyncio.to_thread(_read_cache_file)
+                _MEM_CACHE = (mtime, cached)
+                return cached
     except Exception as e:
         print(f"[ammo] Cache read error: {e}")
 
     # 2) Fetch from GraphQL and rebuild cache
-    url = "https://api.tarkov.dev/graphql"
-    query = """
-    query MyQuery {
-      ammo {
-        item {
-          name
-          normalizedName
-          shortName
-        }
-        ammoType
-        armorDamage
-        caliber
-        damage
-        penetrationChance
-        penetrationPower
-        projectileCount
-        tracer
-        tracerColor
-      }
-    }
-    """
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json={"query": query}) as response:
-                if response.status != 200:
-                    print(f"[ammo] GraphQL error: HTTP {response.status}")
-                    return None
-                payload = await response.json()
+        if session is None:
+            session = await _get_session()
+        async with session.post(_GRAPHQL_URL, data=_AMMO_BODY, headers=_JSON_HEADERS) as response:
+            if response.status != 200:
+                print(f"[ammo] GraphQL error: HTTP {response.status}")
+                return None
+            payload = _json_loads(await response.read())
 
         data = payload.get("data", {})
         ammo_list = data.get("ammo", [])
@@ -72,8 +148,8 @@ async def fetch_ammo_data() -> Optional[Dict[str, Any]]:
         }
 
         try:
-            with open(CACHE_FILE, "w", encoding="utf-8") as f:
-                json.dump(result, f, ensure_ascii=False)
+            await asyncio.to_thread(_write_cache_file, result)
+            _MEM_CACHE = (os.path.getmtime(CACHE_FILE), result)
         except Exception as e:
             print(f"[ammo] Cache write error: {e}")
 
@@ -83,7 +159,15 @@ async def fetch_ammo_data() -> Optional[Dict[str, Any]]:
         return None
 
 
-def _build_match_pools(ammo_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+class _MatchPool(NamedTuple):
+    choices: List[str]  # lowercased keys: names, then shortNames, then normalizedNames
+    entries: List[Dict[str, Any]]  # ammo entry for each choice
+    exact: Dict[str, int]  # key -> first index in choices
+    sorted_keys: List[Tuple[str, int]]  # (key, index) sorted for bisect prefix lookups
+
+
+def _build_match_pools(ammo_data: Dict[str, Any]) -> _MatchPool:
+    """Flatten name/shortName/normalizedName keys into one choice list with parallel entries."""
     names: Dict[str, Any] = {}
     shorts: Dict[str, Any] = {}
     norms: Dict[str, Any] = {}
@@ -99,7 +183,104 @@ def _build_match_pools(ammo_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[
             shorts[short.lower()] = entry
         if norm:
             norms[norm.lower()] = entry
-    return names, shorts, norms
+
+    choices: List[str] = []
+    entries: List[Dict[str, Any]] = []
+    # Names first so they win score ties, as before
+    for pool in (names, shorts, norms):
+        choices.extend(pool.keys())
+        entries.extend(pool.values())
+
+    exact: Dict[str, int] = {}
+    for idx, key in enumerate(choices):
+        exact.setdefault(key, idx)
+    sorted_keys = sorted(exact.items())
+    return _MatchPool(choices, entries, exact, sorted_keys)
+
+
+def _get_match_pools(ammo_data: Dict[str, Any]) -> _MatchPool:
+    """Return the flattened match pool, built once per payload."""
+    version = ammo_data.get("fetchedAt")
+    if version and version in _POOL_CACHE:
+        return _POOL_CACHE[version]
+
+    pools = _build_match_pools(ammo_data)
+    if version:
+        # Only the latest payload is ever searched; drop pools for older ones
+        _POOL_CACHE.clear()
+        _POOL_CACHE[version] = pools
+    return pools
+
+
+def _partial_index(query: str, pool: _MatchPool) -> Optional[int]:
+    """Exact, then prefix, then substring lookup; None when all miss."""
+    idx = pool.exact.get(query)
+    if idx is not None or len(query) < _MIN_PARTIAL_LEN:
+        return idx
+
+    # Keys starting with query form one contiguous run in sorted order; the shortest wins
+    sorted_keys = pool.sorted_keys
+    pos = bisect.bisect_left(sorted_keys, (query, -1))
+    best: Optional[Tuple[int, int]] = None
+    while pos < len(sorted_keys) and sorted_keys[pos][0].startswith(query):
+        key, idx = sorted_keys[pos]
+        if best is None or (len(key), idx) < best:
+            best = (len(key), idx)
+        pos += 1
+    if best is not None:
+        return best[1]
+
+    for idx, key in enumerate(pool.choices):
+        if query in key:
+            return idx
+    return None
+
+
+def _match_index(query: str, pool: _MatchPool) -> Optional[int]:
+    """Index of the best match for `query` in the pool's choices, or None below score 80."""
+    idx = _partial_index(query, pool)
+    if idx is not None:
+        return idx
+
+    choices = pool.choices
+    if rf_process is not None:
+        # Single scan over every key; returns (choice, score, index) or None below the cutoff
+        match = rf_process.extractOne(
+            query,
+            choices,
+            scorer=fuzz.WRatio,
+            processor=rf_utils.default_process,
+            score_cutoff=80,
+        )
+        return match[2] if match else None
+
+    # difflib fallback
+    best_idx = -1
+    best_score = -1.0
+    matcher = difflib.SequenceMatcher(a=query)
+    for idx, choice in enumerate(choices):
+        matcher.set_seq2(choice)
+        # Cheap upper bounds first: skip keys that cannot beat the best so far or reach 80
+        bound = matcher.real_quick_ratio()
+        if bound <= best_score or int(round(bound * 100)) < 80:
+            continue
+        bound = matcher.quick_ratio()
+        if bound <= best_score or int(round(bound * 100)) < 80:
+            continue
+        score = matcher.ratio()
+        if score > best_score:
+            best_score = score
+            best_idx = idx
+    return best_idx if int(round(best_score * 100)) >= 80 else None
+
+
+@functools.lru_cache(maxsize=512)
+def _find_ammo_cached(query: str, version: str) -> Optional[int]:
+    """Memoized _match_index against the pool cached for `version` (a payload's fetchedAt).
+
+    Returns an index rather than the entry so the cache holds no payload references.
+    """
+    return _match_index(query, _POOL_CACHE[version])
 
 
 def find_ammo(ammo_data: Dict[str, Any], search_term: str) -> Optional[Dict[str, Any]]:
@@ -107,53 +288,34 @@ def find_ammo(ammo_data: Dict[str, Any], search_term: str) -> Optional[Dict[str,
     if not ammo_data or "ammo" not in ammo_data:
         return None
 
-    names, shorts, norms = _build_match_pools(ammo_data)
+    pool = _get_match_pools(ammo_data)
+    if not pool.choices:
+        return None
     query = search_term.lower().strip()
 
-    def best_match_dict(query_str: str, pool: Dict[str, Any]):
-        if fw_process is not None:
-            return fw_process.extractOne(query_str, list(pool.keys()))  # (choice, score)
-        # difflib fallback
-        if not pool:
-            return None
-        choices = list(pool.keys())
-        best = None
-        best_score = -1.0
-        for choice in choices:
-            score = difflib.SequenceMatcher(a=query_str, b=choice).ratio()
-            if score > best_score:
-                best_score = score
-                best = choice
-        return (best, int(round(best_score * 100))) if best is not None else None
-
-    candidates = []
-    for pool in (names, shorts, norms):
-        match = best_match_dict(query, pool)
-        if match and match[0] in pool:
-            candidates.append((pool[match[0]], match[1]))
+    # Repeat searches against the same payload are a dict hit; a new fetchedAt misses naturally
+    version = ammo_data.get("fetchedAt")
+    idx = _find_ammo_cached(query, version) if version else _match_index(query, pool)
+    return pool.entries[idx] if idx is not None else None
 
-    if not candidates:
-        return None
 
-    # Pick highest score above threshold
-    best_entry, best_score = max(candidates, key=lambda t: t[1])
-    return best_entry if best_score >= 80 else None
+# Embed colour by penetration tier: <20 green, 20+ yellow, 30+ orange, 50+ red
+_PEN_BREAKS = (20, 30, 50)
+_PEN_COLORS = (0x00FF00, 0xFFFF00, 0xFFA500, 0xFF0000)
 
 
 def _pen_color(pen: Optional[int]) -> int:
     if isinstance(pen, int):
-        if pen >= 50:
-            return 0xFF0000  # red
-        if pen >= 30:
-            return 0xFFA500  # orange
-        if pen >= 20:
-            return 0xFFFF00  # yellow
-    return 0x00FF00  # green
+        return _PEN_COLORS[bisect.bisect_right(_PEN_BREAKS, pen)]
+    return _PEN_COLORS[0]
 
 
 def _format_pct(v: Optional[float]) -> str:
     if v is None:
         return "N/A"
+    # Whole percentages need no float round-trip (1 is a fraction, handled below)
+    if type(v) is int and (v == 0 or 1 < v <= 100):
+        return f"{v}%"
     try:
         val = float(v)
         if 0 < val <= 1:
@@ -163,12 +325,12 @@ def _format_pct(v: Optional[float]) -> str:
         return str(v)
 
 
-def _format_cached_age(fetched_at: Optional[str]) -> Optional[str]:
+def _format_cached_age(fetched_at: Optional[str], now: Optional[datetime] = None) -> Optional[str]:
     if not fetched_at:
         return None
     try:
         dt = datetime.fromisoformat(fetched_at.replace("Z", "+00:00"))
-        mins = int((datetime.now(tz.utc) - dt).total_seconds() / 60)
+        mins = int(((now or datetime.now(tz.utc)) - dt).total_seconds() / 60)
         if mins < 60:
             return f"cached {mins}m ago"
         hours = mins // 60
@@ -178,24 +340,23 @@ def _format_cached_age(fetched_at: Optional[str]) -> Optional[str]:
         return None
 
 
-def format_ammo_embed(entry: Dict[str, Any], fetched_at: Optional[str] = None) -> discord.Embed:
-    """Build a detailed Discord embed for an ammo entry."""
-    item = entry.get("item") or {}
-    name = item.get("name") or "Unknown ammo"
-    short = item.get("shortName")
-    norm = item.get("normalizedName")
-
-    ammo_type = entry.get("ammoType")
-    caliber = entry.get("caliber")
-    dmg = entry.get("damage")
-    pen = entry.get("penetrationPower")
-    pen_chance = entry.get("penetrationChance")
-    armor_dmg = entry.get("armorDamage")
-    pellets = entry.get("projectileCount") or 1
-    tracer = entry.get("tracer")
-    tracer_color = entry.get("tracerColor")
-
-    color = _pen_color(pen if isinstance(pen, int) else None)
+@functools.lru_cache(maxsize=256)
+def _ammo_embed_template(
+    name: str,
+    short: Optional[str],
+    norm: Optional[str],
+    ammo_type: Any,
+    caliber: Any,
+    dmg: Any,
+    pen: Any,
+    pen_chance: Any,
+    armor_dmg: Any,
+    pellets: Any,
+    tracer: Any,
+    tracer_color: Any,
+) -> discord.Embed:
+    """Build the static part of an ammo embed; callers must copy before mutating."""
+    color = _pen_color(pen)
 
     title = name
     if short and short != name:
@@ -233,8 +394,31 @@ def format_ammo_embed(entry: Dict[str, Any], fetched_at: Optional[str] = None) -
             tracer_text += f" ({tracer_color})"
         embed.add_field(name="Tracer", value=tracer_text, inline=True)
 
+    return embed
+
+
+def format_ammo_embed(entry: Dict[str, Any], fetched_at: Optional[str] = None) -> discord.Embed:
+    """Build a detailed Discord embed for an ammo entry."""
+    now = datetime.now(tz.utc)
+    item = entry.get("item") or {}
+    # Fields are keyed by value so the memo holds no payload references; only the footer varies
+    embed = _ammo_embed_template(
+        item.get("name") or "Unknown ammo",
+        item.get("shortName"),
+        item.get("normalizedName"),
+        entry.get("ammoType"),
+        entry.get("caliber"),
+        entry.get("damage"),
+        entry.get("penetrationPower"),
+        entry.get("penetrationChance"),
+        entry.get("armorDamage"),
+        entry.get("projectileCount") or 1,
+        entry.get("tracer"),
+        entry.get("tracerColor"),
+    ).copy()
+
     # Footer with cache age
-    age = _format_cached_age(fetched_at)
+    age = _format_cached_age(fetched_at, now)
     if age:
         embed.set_footer(text=age)
 
@@ -1,6 +1,169 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, NamedTuple, Optional
 import math
-import random as _rand
+import threading
+
+import numpy as np
+
+from cultist_numba import HAVE_NUMBA, INF, dp_bounded as _dp_bounded, dp_unbounded as _dp_unbounded
+
+
+# Solved selections keyed by (fetchedAt, mode, threshold, max_items), oldest first
+_RESULT_CACHE: Dict[tuple, Dict[str, Any]] = {}
+_RESULT_CACHE_SIZE = 128
+
+# Solves run on executor threads (asyncio.to_thread), so writers take this lock
+_RESULT_LOCK = threading.Lock()
+
+
+def _store_result(key: tuple, result: Dict[str, Any]) -> None:
+    """Cache a solved selection; entries for older payloads are dropped."""
+    with _RESULT_LOCK:
+        if any(k[0] != key[0] for k in _RESULT_CACHE):
+            _RESULT_CACHE.clear()
+        elif len(_RESULT_CACHE) >= _RESULT_CACHE_SIZE:
+            _RESULT_CACHE.pop(next(iter(_RESULT_CACHE)))
+        _RESULT_CACHE[key] = dict(result)
+
+
+class _Candidates(NamedTuple):
+    """Eligible items for one (payload, mode) as parallel columns (SoA)."""
+    names: List[str]
+    links: List[Optional[str]]
+    vendor_labels: List[str]
+    value_col: List[int]
+    cost_col: List[int]
+    limit_col: List[int]  # trader buy limit, 0 when unlimited (PvE is always 0)
+    values: np.ndarray  # value_col as int32
+    costs: np.ndarray  # cost_col as int32
+
+
+# Cost multiplier for randomized tie-breaks; leaves room for 2**16 // K of jitter per pick
+_TIE_SCALE = 1 << 16
+
+# Selection line templates, bound once; str.format ignores the unused vendor arg in PvE
+_PVP_LINE = "x{} — {} | value {:,}₽ | cost {:,}₽ | {}".format
+_PVE_LINE = "x{} — {} | value {:,}₽ | cost {:,}₽".format
+
+
+# Candidate columns keyed by (fetchedAt, mode); only the latest payload is kept
+_CANDIDATE_CACHE: Dict[tuple, _Candidates] = {}
+_CANDIDATE_LOCK = threading.Lock()
+
+
+def _build_candidates(items: List[Dict[str, Any]], mode: str) -> _Candidates:
+    # Numeric data goes to NumPy arrays, display-only fields stay in Python
+    # lists indexed by the same position
+    names: List[str] = []
+    links: List[Optional[str]] = []
+    vendor_labels: List[str] = []
+    value_col: List[int] = []
+    cost_col: List[int] = []
+    limit_col: List[int] = []
+    for it in items:
+        value = it.get("basePrice")
+        if not isinstance(value, int) or value <= 0:
+            continue
+        if mode == "pve":
+            cost = it.get("pvePrice")
+            if not isinstance(cost, int) or cost <= 0:
+                continue
+            vendor_label = ""
+            limit = 0
+        else:  # PvP uses trader buy offers (buyFor)
+            cost = it.get("traderBuyPrice")
+            if not isinstance(cost, int) or cost <= 0:
+                continue
+            vendor = it.get("traderBuyVendor")
+            min_level = it.get("traderMinLevel")
+            buy_limit = it.get("traderBuyLimit")
+            limit = buy_limit if isinstance(buy_limit, int) and buy_limit > 0 else 0
+            vendor_label = f"{vendor} L{min_level if isinstance(min_level, int) else '?'}" if vendor else "unknown L?"
+        names.append(it.get("name") or it.get("shortName") or "Unknown")
+        links.append(it.get("link"))
+        vendor_labels.append(vendor_label)
+        value_col.append(value)
+        cost_col.append(cost)
+        limit_col.append(limit)
+    return _Candidates(
+        names, links, vendor_labels, value_col, cost_col, limit_col,
+        np.array(value_col, dtype=np.int32), np.array(cost_col, dtype=np.int32),
+    )
+
+
+def _get_candidates(items_data: Dict[str, Any], mode: str) -> _Candidates:
+    """Return the candidate columns for this payload and mode, built once per fetchedAt."""
+    version = items_data.get("fetchedAt")
+    key = (version, mode)
+    if version and key in _CANDIDATE_CACHE:
+        return _CANDIDATE_CACHE[key]
+
+    cands = _build_candidates(items_data["items"], mode)
+    if version:
+        # Built outside the lock; only the evict-and-insert is serialized across solver threads
+        with _CANDIDATE_LOCK:
+            if any(k[0] != version for k in _CANDIDATE_CACHE):
+                _CANDIDATE_CACHE.clear()
+            _CANDIDATE_CACHE[key] = cands
+    return cands
+
+
+def _dp_unbounded_np(vbs, costs, dp, prevV, prevI):
+    """NumPy fallback for _dp_unbounded when Numba is missing.
+
+    Row ccount only reads row ccount - 1, so each (ccount, candidate) pair
+    updates a whole row slice at once. Visiting candidates in index order with
+    a strictly-cheaper test keeps the scalar kernel's first-argmin tie-break.
+    """
+    K = dp.shape[0] - 1
+    vb_max = dp.shape[1] - 1
+    for ccount in range(1, K + 1):
+        base_prev = dp[ccount - 1]
+        for i in range(len(vbs)):
+            ivb = int(vbs[i])
+            if ivb > vb_max:
+                continue
+            # Unreachable predecessors stay >= INF after adding the cost, so never win
+            cand = base_prev[: vb_max + 1 - ivb] + int(costs[i])
+            row = dp[ccount, ivb:]
+            better = cand < row
+            if better.any():
+                row[better] = cand[better]
+                prevV[ccount, ivb:][better] = np.nonzero(better)[0]
+                prevI[ccount, ivb:][better] = i
+
+
+def _dp_bounded_np(unit_vbs, unit_costs, unit_mults, dp, prevV, prevU):
+    """NumPy fallback for _dp_bounded when Numba is missing.
+
+    Row ccount only reads row ccount - take, so each (unit, ccount) pair updates
+    a whole row slice at once with the same strictly-cheaper rule.
+    """
+    K = dp.shape[0] - 1
+    vb_max = dp.shape[1] - 1
+    for u_idx in range(len(unit_vbs)):
+        ivb = int(unit_vbs[u_idx])
+        icost = int(unit_costs[u_idx])
+        take = int(unit_mults[u_idx])
+        if ivb > vb_max:
+            continue  # bundle overshoots every bucket (the scalar vb loop is empty too)
+        for ccount in range(K, take - 1, -1):
+            # Unreachable predecessors stay >= INF after adding icost, so never win
+            cand = dp[ccount - take, : vb_max + 1 - ivb] + icost
+            row = dp[ccount, ivb:]
+            better = cand < row
+            if better.any():
+                row[better] = cand[better]
+                prevV[ccount, ivb:][better] = np.nonzero(better)[0]
+                prevU[ccount, ivb:][better] = u_idx
+
+
+def _dp_tables(K: int, vb_max: int):
+    """Allocate contiguous (dp, prevV, prevI) tables; back-pointers fit in int32."""
+    dp = np.full((K + 1, vb_max + 1), INF, dtype=np.int64)
+    prevV = np.full_like(dp, -1, dtype=np.int32)
+    prevI = np.full_like(dp, -1, dtype=np.int32)
+    dp[0, 0] = 0
+    return dp, prevV, prevI
 
 
 def compute_cultist_selection(
@@ -24,187 +187,138 @@ def compute_cultist_selection(
 
     selected_mode = mode or "pvp"
 
-    # Build candidate list
-    candidates: List[Dict[str, Any]] = []
-    for it in items_data["items"]:
-        value = it.get("basePrice")
-        if not isinstance(value, int) or value <= 0:
-            continue
-        if selected_mode == "pve":
-            cost = it.get("pvePrice")
-            if not isinstance(cost, int) or cost <= 0:
-                continue
-            candidates.append({
-                "name": it.get("name") or it.get("shortName") or "Unknown",
-                "value": value,
-                "cost": cost,
-                "link": it.get("link"),
-            })
-        else:  # PvP uses trader buy offers (buyFor)
-            cost = it.get("traderBuyPrice")
-            if not isinstance(cost, int) or cost <= 0:
-                continue
-            vendor = it.get("traderBuyVendor")
-            min_level = it.get("traderMinLevel")
-            buy_limit = it.get("traderBuyLimit")
-            # Clamp limit between 1 and max_items (if missing, treat as unlimited up to max_items)
-            if isinstance(buy_limit, int) and buy_limit > 0:
-                cap = min(buy_limit, max_items)
-            else:
-                cap = max_items
-            vendor_label = f"{vendor} L{min_level if isinstance(min_level, int) else '?'}" if vendor else "unknown L?"
-            candidates.append({
-                "name": it.get("name") or it.get("shortName") or "Unknown",
-                "value": value,
-                "cost": cost,
-                "link": it.get("link"),
-                "vendor": vendor,
-                "vendor_label": vendor_label,
-                "cap": cap,
-            })
-
-    if not candidates:
-        raise ValueError("No valid candidates")
+    # Deterministic solves are pure in (payload, mode, threshold, max_items); reuse them
+    version = items_data.get("fetchedAt")
+    cache_key = (version, selected_mode, threshold, max_items) if version and not randomize else None
+    if cache_key is not None:
+        cached = _RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            return dict(cached)
 
-    if randomize:
-        _rand.shuffle(candidates)
+    # Filtering and column building only depend on the payload and mode
+    cands = _get_candidates(items_data, selected_mode)
+    names, links, vendor_labels = cands.names, cands.links, cands.vendor_labels
+    value_col, cost_col, limit_col = cands.value_col, cands.cost_col, cands.limit_col
+    values, costs = cands.values, cands.costs
+
+    if not names:
+        raise ValueError("No valid candidates")
 
     # DP parameters
     STEP = 500
     MAX_OVER = 50_000
     K = max(1, max_items)
+
+    # Randomized ties: scale costs and add a random epsilon per candidate. At most
+    # K picks keep the epsilon sum below one scaled rouble, so every cell still holds
+    # its true minimum cost and the epsilon only picks among equal-cost selections
+    # for that cell; cached columns stay as-is.
+    tie_scale = 1
+    if randomize:
+        tie_scale = _TIE_SCALE
+        eps = np.random.randint(0, max(1, _TIE_SCALE // K), size=len(costs))
+        costs = costs.astype(np.int64) * tie_scale + eps
     tb = math.ceil(threshold / STEP)
     vb_max = math.ceil((threshold + MAX_OVER) / STEP)
 
-    # Precompute value buckets
-    for c in candidates:
-        c["vb"] = min(math.ceil(c["value"] / STEP), vb_max)
-
-    INF = 10**18
+    # Value buckets (ceil(value / STEP), capped at vb_max); int32 since vb_max follows the threshold
+    vbs = np.minimum((values.astype(np.int64) + STEP - 1) // STEP, vb_max).astype(np.int32)
 
+    # pick_to_cand / pick_mult map the index stored in prevI back to a candidate
+    # position and the number of copies that pick adds
     if selected_mode == "pve":
-        # Unbounded DP (original logic)
-        dp = [[INF] * (vb_max + 1) for _ in range(K + 1)]
-        prevV = [[-1] * (vb_max + 1) for _ in range(K + 1)]
-        prevI = [[-1] * (vb_max + 1) for _ in range(K + 1)]
-        dp[0][0] = 0
-
-        for ccount in range(1, K + 1):
-            for vb in range(0, vb_max + 1):
-                best_cost = dp[ccount][vb]
-                best_prev_v = -1
-                best_prev_i = -1
-                base_prev = dp[ccount - 1]
-                for idx, it in enumerate(candidates):
-                    ivb = it["vb"]
-                    pv = vb - ivb
-                    if pv < 0:
-                        continue
-                    cost_prev = base_prev[pv]
-                    if cost_prev == INF:
-                        continue
-                    new_cost = cost_prev + it["cost"]
-                    if new_cost < best_cost:
-                        best_cost = new_cost
-                        best_prev_v = pv
-                        best_prev_i = idx
-                if best_cost < dp[ccount][vb]:
-                    dp[ccount][vb] = best_cost
-                    prevV[ccount][vb] = best_prev_v
-                    prevI[ccount][vb] = best_prev_i
+        # With repetition allowed, only the cheapest candidate of each value bucket
+        # (earliest on equal cost) can ever win a cell, so drop the rest: N shrinks to
+        # at most vb_max + 1 without changing the DP result or its tie-breaks.
+        order = np.lexsort((np.arange(len(vbs)), costs, vbs))
+        first_in_bucket = np.ones(len(order), dtype=bool)
+        first_in_bucket[1:] = vbs[order[1:]] != vbs[order[:-1]]
+        keep = np.sort(order[first_in_bucket])
+        pick_to_cand = keep.tolist()
+        pick_mult = [1] * len(pick_to_cand)
+
+        dp, prevV, prevI = _dp_tables(K, vb_max)
+        if HAVE_NUMBA:
+            _dp_unbounded(vbs[keep], costs[keep], dp, prevV, prevI)
+        else:
+            _dp_unbounded_np(vbs[keep], costs[keep], dp, prevV, prevI)
     else:
-        # PvP: bounded by buyLimit. Convert to 0/1 DP over expanded units.
-        # Expand each candidate into cap "units" so each can be taken at most once.
-        units: List[Dict[str, Any]] = []
-        for idx, c in enumerate(candidates):
-            cap = c.get("cap", K)
-            cap = max(1, min(K, cap))
-            for _ in range(cap):
-                units.append({
-                    "idx": idx,
-                    "vb": c["vb"],
-                    "cost": c["cost"],
-                })
-
-        dp = [[INF] * (vb_max + 1) for _ in range(K + 1)]
-        prevV = [[-1] * (vb_max + 1) for _ in range(K + 1)]
-        prevU = [[-1] * (vb_max + 1) for _ in range(K + 1)]  # unit index used
-        dp[0][0] = 0
-
-        for u_idx, u in enumerate(units):
-            ivb = u["vb"]
-            icost = u["cost"]
-            for ccount in range(K, 0, -1):  # descending for 0/1
-                for vb in range(vb_max, ivb - 1, -1):
-                    pv = vb - ivb
-                    if dp[ccount - 1][pv] == INF:
-                        continue
-                    new_cost = dp[ccount - 1][pv] + icost
-                    if new_cost < dp[ccount][vb]:
-                        dp[ccount][vb] = new_cost
-                        prevV[ccount][vb] = pv
-                        prevU[ccount][vb] = u_idx
-
-    # Collect feasible solutions
-    options = []  # (cost, count, vb)
-    for ccount in range(1, K + 1):
-        for vb in range(tb, vb_max + 1):
-            cost = dp[ccount][vb]
-            if cost < INF:
-                options.append((cost, ccount, vb))
+        # PvP: bounded by buyLimit. Binary-split each candidate's cap into units of
+        # 1, 2, 4, ... copies (remainder last) so any count 0..cap is a subset of
+        # units, then run a 0/1 DP over log2(cap) units per item instead of cap.
+        unit_idx: List[int] = []
+        unit_mult: List[int] = []
+        for idx, limit in enumerate(limit_col):
+            # Clamp limit between 1 and max_items (if missing, treat as unlimited up to max_items)
+            cap = min(limit, max_items) if limit > 0 else max_items
+            remaining = max(1, min(K, cap))
+            take = 1
+            while remaining > 0:
+                take = min(take, remaining)
+                unit_idx.append(idx)
+                unit_mult.append(take)
+                remaining -= take
+                take *= 2
+        dp, prevV, prevI = _dp_tables(K, vb_max)
+        units = np.array(unit_idx, dtype=np.int64)
+        mults = np.array(unit_mult, dtype=np.int64)
+        unit_vbs = vbs[units].astype(np.int64) * mults
+        unit_costs = costs[units].astype(np.int64) * mults
+        if HAVE_NUMBA:
+            _dp_bounded(unit_vbs, unit_costs, mults, dp, prevV, prevI)
+        else:
+            _dp_bounded_np(unit_vbs, unit_costs, mults, dp, prevV, prevI)
+        # prevI holds the unit index used for each cell in this mode
+        pick_to_cand = unit_idx
+        pick_mult = unit_mult
 
-    if not options:
+    # Pick by min cost, then fewer items, then lower vb (least overshoot): argmin's
+    # first hit in row-major order over the feasible block is exactly that triple.
+    # Rank on the true cost so the epsilon never outweighs the count/overshoot order.
+    feasible = dp[1:, tb:]
+    if feasible.size == 0:
         raise ValueError("No feasible selection for given constraints")
-
-    # Pick by min cost, then fewer items, then lower vb (least overshoot)
-    options.sort(key=lambda t: (t[0], t[1], t[2]))
-    best_cost, best_count, best_vb = options[0]
+    true_cost = feasible // tie_scale if tie_scale > 1 else feasible
+    flat_best = int(true_cost.argmin())
+    if int(feasible.flat[flat_best]) >= INF:
+        raise ValueError("No feasible selection for given constraints")
+    best_cost = int(true_cost.flat[flat_best])
+    row_off, col_off = divmod(flat_best, feasible.shape[1])
+    best_count, best_vb = row_off + 1, tb + col_off
 
     # Reconstruct
-    counts: Dict[int, int] = {}
+    counts = np.zeros(len(names), dtype=np.int32)  # copies picked per candidate (<= K; max_items is not clamped)
     ccount, vb = best_count, best_vb
-    if selected_mode == "pve":
-        while ccount > 0 and vb >= 0:
-            idx = prevI[ccount][vb]
-            pv = prevV[ccount][vb]
-            if idx is None or idx < 0 or pv < 0:
-                break
-            counts[idx] = counts.get(idx, 0) + 1
-            vb = pv
-            ccount -= 1
-    else:
-        # Aggregate by candidate index via used units
-        while ccount > 0 and vb >= 0:
-            u_idx = prevU[ccount][vb]
-            pv = prevV[ccount][vb]
-            if u_idx is None or u_idx < 0 or pv < 0:
-                break
-            cand_idx = units[u_idx]["idx"]
-            counts[cand_idx] = counts.get(cand_idx, 0) + 1
-            vb = pv
-            ccount -= 1
+    while ccount > 0 and vb >= 0:
+        pick = int(prevI[ccount][vb])
+        pv = int(prevV[ccount][vb])
+        if pick < 0 or pv < 0:
+            break
+        cand_idx = pick_to_cand[pick]
+        counts[cand_idx] += pick_mult[pick]
+        vb = pv
+        ccount -= pick_mult[pick]
 
     # Aggregate output
     sel_lines: List[str] = []
     total_value = 0
     total_cost = 0
-    for idx, cnt in sorted(counts.items(), key=lambda x: (-candidates[x[0]]["value"], candidates[x[0]]["cost"])):
-        item = candidates[idx]
-        total_value += item["value"] * cnt
-        total_cost += item["cost"] * cnt
-        name_disp = f"[{item['name']}]({item['link']})" if item.get("link") else item["name"]
-        if selected_mode == "pvp":
-            vendor_lbl = item.get("vendor_label") or ""
-            sel_lines.append(
-                f"x{cnt} — {name_disp} | value {item['value']:,}₽ | cost {item['cost']:,}₽ | {vendor_lbl}"
-            )
-        else:
-            sel_lines.append(
-                f"x{cnt} — {name_disp} | value {item['value']:,}₽ | cost {item['cost']:,}₽"
-            )
+    picked = np.nonzero(counts)[0].tolist()
+    fmt_line = _PVP_LINE if selected_mode == "pvp" else _PVE_LINE
+    for idx in sorted(picked, key=lambda i: (-value_col[i], cost_col[i])):
+        cnt = int(counts[idx])
+        value = value_col[idx]
+        cost = cost_col[idx]
+        total_value += value * cnt
+        total_cost += cost * cnt
+        name_disp = f"[{names[idx]}]({links[idx]})" if links[idx] else names[idx]
+        sel_lines.append(fmt_line(cnt, name_disp, value, cost, vendor_labels[idx]))
 
-    return {
+    result = {
         "total_value": total_value,
         "total_cost": best_cost,
         "sel_lines": sel_lines,
     }
+    if cache_key is not None:
+        _store_result(cache_key, result)
+    return result
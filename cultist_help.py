@@ -1,193 +1,307 @@
 from __future__ import annotations
 
 import datetime
-from typing import Callable
+import functools
+import re
+from types import MappingProxyType
+from typing import Callable, Mapping
 
 import discord
 
+# Optional multi-pattern matcher: prefer pyahocorasick if installed; fallback to one compiled regex
+try:
+    import ahocorasick  # type: ignore
+except Exception:  # ModuleNotFoundError or others
+    ahocorasick = None
 
-def get_cultist_help_response(question: str) -> str:
-    """Return a short, canned explanation to a Cultist Circle help question.
+_UTC = datetime.timezone.utc
 
-    Covers thresholds, base-value math, item combos, pricing modes, and features.
 
-    Args:
-        question: Raw user query.
+# Help rules in priority order: (rule_id, terms, requires). A rule matches when any
+# of `terms` and every one of `requires` occurs in the lowercased question; the
+# earliest matching rule wins, so order here is the old if/elif order. Compound
+# conditions ("pvp" and "flea") are extra rows sharing the rule_id.
+_RULES: tuple[tuple[str, tuple[str, ...], tuple[str, ...]], ...] = (
+    # Thresholds and durations
+    ("SIX_HOUR", ("6h", "6 h", "6-hour", "six hour"), ()),
+    ("FOURTEEN_HOUR", ("14h", "14 h", "better loot"), ()),
+    ("TWELVE_HOUR", ("12h", "12 h", "default"), ()),
+    ("THRESHOLDS", ("threshold", "thresholds", "explain thresholds"), ()),
+    # Base value calculation and examples
+    ("BASE_VALUE", ("base value", "multiplier", "vendor"), ()),
+    ("MOONSHINE", ("moonshine",), ()),
+    ("VASE", ("vase", "antique"), ()),
+    # Item count rule
+    ("ITEM_COUNT", ("how many", "how much", "items", "slots"), ()),
+    # Weapon-specific behavior and example combos
+    ("WEAPON", ("weapon", "weapons", "gun"), ()),
+    ("DURABILITY", ("durability",), ()),
+    ("MP5SD", ("mp5sd", "slim diary"), ()),
+    ("FLASH_DRIVE", ("flash drive",), ()),
+    ("MP5", ("5x mp5", "5 x mp5", "five mp5", "mp5"), ()),
+    ("G28", ("g28", "labs access", "labs card"), ()),
+    # Features from Instructions
+    ("AUTO_SELECT", ("auto select", "autoselect"), ()),
+    ("PIN", ("pin",), ()),
+    ("OVERRIDE", ("override",), ()),
+    ("SHARE", ("share",), ()),
+    ("RED_PRICE", ("red price", "unstable"), ()),
+    ("YELLOW_PRICE", ("yellow price", "manual"), ()),
+    ("EXCLUDE", ("exclude", "categories"), ()),
+    ("SORT", ("sort",), ()),
+    # PVP flea status and trader pricing
+    ("PVP_FLEA", ("pvp",), ("flea",)),
+    ("PVP_FLEA", ("flea disabled", "flea off"), ()),
+    ("TRADER_PRICE", ("trader price", "price mode", "trader levels"), ()),
+    ("HARDCORE", ("hardcore", "l1 traders", "ll1"), ()),
+    ("HARDCORE", ("level 1",), ("trader",)),
+    ("LIMITATION", ("limitation", "wip", "work in progress", "quest locked"), ()),
+    ("MODE", ("mode", "pve", "pvp"), ()),
+    ("TIPS", ("tips", "strategy", "optimal"), ()),
+    ("DISCORD", ("discord", "discord server", "discord community"), ()),
+    # Calculator usage
+    ("CALCULATOR", ("calculator", "how to use", "use it", "help"), ()),
+)
 
-    Returns:
-        A single-paragraph response suitable for an embed description.
+# Terms that only refine the WEAPON rule into its "higher base values" variant
+_WEAPON_HIGHER_TERMS = ("investigating", "higher", "base")
+
+# Embed colour by topic cluster, checked in order; green when none match
+_COLOR_RULES: tuple[tuple[tuple[str, ...], int], ...] = (
+    (("6h", "6-hour", "14h", "12h"), 0x9b59b6),  # purple
+    (("base value", "multiplier", "vendor"), 0x3498db),  # blue
+    (("weapon", "mp5", "g28"), 0xe67e22),  # orange
+)
+_DEFAULT_COLOR = 0x2ecc71  # green
+
+# Threshold/timing table as a markdown code block, built once at import
+_THRESHOLDS_TABLE = (
+    "```\n"
+    "┌───────────────────┬──────────┬───────────────────────────────────────┐\n"
+    "│ Range (Value)     │ Time     │ Results                               │\n"
+    "├───────────────────┼──────────┼───────────────────────────────────────┤\n"
+    "│ 0 - 10,000        │ 2 hours  │ Normal value item                     │\n"
+    "│ 10,001 - 25,000   │ 3 hours  │ Normal value item                     │\n"
+    "│ 25,001 - 50,000   │ 4 hours  │ Normal value item                     │\n"
+    "│ 50,001 - 100,000  │ 5 hours  │ Normal value item                     │\n"
+    "│ 100,001 - 200,000 │ 8 hours  │ Normal value item                     │\n"
+    "│ 200,001 - 349,999 │ 12 hours │ Normal value item (guaranteed)        │\n"
+    "│ 350,000 - 399,999 │ 12h or   │ Normal (12h) or High tier (14h)       │\n"
+    "│                   │ 14 hours │                                       │\n"
+    "│ ≥ 400,000         │ 14h / 6h │ High tier (75%) / Quest-Hideout (25%) │\n"
+    "└───────────────────┴──────────┴───────────────────────────────────────┘\n"
+    "```"
+)
+
+# Canned answers keyed by rule id; read-only so the shared strings can't be swapped at runtime
+_RESPONSES: Mapping[str, str] = MappingProxyType({
+    "SIX_HOUR": (
+        "6h (quest/hideout items) requires ≥400k base value. At ≥400k: 25% 6h, 75% 14h (high tier loot). "
+        "Going over 400k doesn't increase the chance."
+    ),
+    "FOURTEEN_HOUR": (
+        "≥350k gives a chance at 14h (high tier loot). "
+        "At ≥400k: 75% 14h, 25% 6h (quest/hideout items)."
+    ),
+    "TWELVE_HOUR": "12h (normal loot) is the default. <350k is guaranteed 12h; 350–399k can give 12h (normal) or 14h (high tier).",
+    "THRESHOLDS": _THRESHOLDS_TABLE,
+    "BASE_VALUE": (
+        "Base value = vendor sell price ÷ vendor trading multiplier (avoid Fence). "
+        "Example: 126,000 ÷ 0.63 = 200,000."
+    ),
+    "MOONSHINE": "Moonshine base value: 126,000 ÷ 0.63 = 200,000. Two bottles reach 400k (6h/14h pool).",
+    "VASE": (
+        "Antique Vase: 33,222 ÷ 0.49 ≈ 67,800. Five = ~339k (12h). "
+        "1 Moonshine + 3 Vases ≈ 403.4k (6h/14h pool)."
+    ),
+    "ITEM_COUNT": (
+        "You can place 1–5 items in the circle. Any mix is fine as long as total "
+        "base value hits your target threshold."
+    ),
+    "WEAPON_HIGHER": (
+        "We're investigating why some weapons return higher base values in the circle; "
+        "weapon-specific values may apply."
+    ),
+    "WEAPON": (
+        "Weapons have special circle values; vendor-base math may not apply. "
+        "Durability can affect value, so totals can differ."
+    ),
+    "DURABILITY": "Item durability can influence effective circle value, especially for weapons.",
+    "MP5SD": (
+        "Reported combo: 2× MP5SD (~$900 total from Peacekeeper) + 1× Slim Diary (~40–50k₽) "
+        "can reach the 400k threshold due to weapon-specific values."
+    ),
+    "FLASH_DRIVE": (
+        "Flash Drive may be a cheaper alternative to Slim Diary depending on market; "
+        "try 2× MP5SD + Diary/Flash Drive."
+    ),
+    "MP5": (
+        "Reported combo: 5× MP5 (Peacekeeper L1) can trigger 6/14h due to special weapon circle values."
+    ),
+    "G28": (
+        "Reported combo: 1× G28 Patrol Rifle via barter (1 Labs Access Card, ~166k from Therapist) "
+        "can trigger 6/14h due to special weapon values."
+    ),
+    "AUTO_SELECT": "Auto Select finds the most cost-effective combo to hit your target (e.g., ≥400k) automatically.",
+    "PIN": "Pin locks chosen items so Auto Select must include them in the final combination.",
+    "OVERRIDE": "Override lets you set custom flea prices when market differs from API data.",
+    "SHARE": "Share creates a compact code to save or send your selection to others.",
+    "RED_PRICE": "Red price text = unstable flea price (low offer count at capture).",
+    "YELLOW_PRICE": "Yellow price text = price manually overridden by you.",
+    "EXCLUDE": "Exclude categories you don't want to sacrifice to narrow results.",
+    "SORT": "Sort items by most recently updated or best value for rubles.",
+    "PVP_FLEA": (
+        "PVP: Flea is disabled. Use Settings → Price Mode: Trader, then set Trader Levels "
+        "to calculate trader-only prices."
+    ),
+    "TRADER_PRICE": (
+        "Switch Price Mode to Trader in Settings, then pick your Trader Levels (LL1–LL4) "
+        "to use trader-only prices."
+    ),
+    "HARDCORE": (
+        "Hardcore PVP tip (LL1): 5× MP5 from Peacekeeper ≈ 400k+. Cost: $478 (~63,547₽) × 5 = $2,390 (~317,735₽)."
+    ),
+    "LIMITATION": "Trader pricing is work-in-progress: quest-locked items are currently included.",
+    "MODE": "Toggle PVE/PVP to match the correct flea market for pricing/search.",
+    "TIPS": (
+        "Aim slightly over 400k, use Auto Select, pin items you own, and ensure relevant quests are active for quest rewards."
+    ),
+    "DISCORD": (
+        "Join our Discord server for support, updates, and community discussion. https://discord.com/invite/3dFmr5qaJK"
+    ),
+    "CALCULATOR": (
+        "Pick up to 5 items and check total base value: ≥350k for 14h (high tier) chance; ≥400k for 25% 6h (quest/hideout) / 75% 14h (high tier). "
+        "Base value uses vendor price ÷ multiplier."
+    ),
+})
+
+# Static legend shown under every help answer
+_LOOT_TIERS_VALUE = "- 12h — normal loot\n- 14h — high tier loot\n- 6h — quest/hideout items"
+
+_DEFAULT_RESPONSE = (
+    "Ask about thresholds (350k/400k), 6h/12h/14h chances, base value math (vendor ÷ trader multiplier), "
+    "PVE/PVP flea, item combos, Auto Select/Pin/Override/Share/Refresh, price indicators, excluding categories, sorting, tips, or Discord."
+)
+
+def _build_term_rules() -> dict[str, list[int]]:
+    """Map each term to the (ascending) indices of _RULES rows listing it in `terms`."""
+    term_rules: dict[str, list[int]] = {}
+    for idx, (_, terms, _) in enumerate(_RULES):
+        for t in terms:
+            term_rules.setdefault(t, []).append(idx)
+    return term_rules
+
+
+def _match_words() -> set[str]:
+    """Every rule, requirement, weapon refinement, and colour term."""
+    words = {t for _, terms, requires in _RULES for t in terms + requires}
+    words.update(t for terms, _ in _COLOR_RULES for t in terms)
+    words.update(_WEAPON_HIGHER_TERMS)
+    return words
+
+
+def _build_automaton():
+    """One automaton over every match word."""
+    automaton = ahocorasick.Automaton()
+    for t in _match_words():
+        automaton.add_word(t, t)
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_word_regex() -> tuple[re.Pattern[str], dict[str, frozenset[str]]]:
+    """Fallback scanner: one compiled alternation tried at every position.
+
+    The zero-width lookahead lets matches overlap; alternatives are longest first,
+    so each position reports its longest word and the shorter words that share that
+    start are recovered from the returned word -> contained-words map.
     """
-    q = question.lower().strip()
+    words = sorted(_match_words(), key=lambda t: (-len(t), t))
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, words)) + "))")
+    contained = {w: frozenset(t for t in words if t in w) for w in words}
+    return pattern, contained
 
-    def in_q(*terms: str) -> bool:
-        return any(t in q for t in terms)
 
-    # Thresholds and durations
-    if in_q("6h", "6 h", "6-hour", "six hour"):
-        return (
-            "6h (quest/hideout items) requires ≥400k base value. At ≥400k: 25% 6h, 75% 14h (high tier loot). "
-            "Going over 400k doesn't increase the chance."
-        )
-    elif in_q("14h", "14 h", "better loot"):
-        return (
-            "≥350k gives a chance at 14h (high tier loot). "
-            "At ≥400k: 75% 14h, 25% 6h (quest/hideout items)."
-        )
-    elif in_q("12h", "12 h", "default"):
-        return "12h (normal loot) is the default. <350k is guaranteed 12h; 350–399k can give 12h (normal) or 14h (high tier)."
-
-    # Threshold summary - return formatted table
-    elif in_q("threshold", "thresholds", "explain thresholds"):
-        return get_thresholds_table()
-
-    # Base value calculation
-    elif in_q("base value", "multiplier", "vendor"):
-        return (
-            "Base value = vendor sell price ÷ vendor trading multiplier (avoid Fence). "
-            "Example: 126,000 ÷ 0.63 = 200,000."
-        )
-
-    # Examples
-    elif in_q("moonshine"):
-        return "Moonshine base value: 126,000 ÷ 0.63 = 200,000. Two bottles reach 400k (6h/14h pool)."
-    elif in_q("vase", "antique"):
-        return (
-            "Antique Vase: 33,222 ÷ 0.49 ≈ 67,800. Five = ~339k (12h). "
-            "1 Moonshine + 3 Vases ≈ 403.4k (6h/14h pool)."
-        )
+def _scan_words(q: str) -> set[str]:
+    """Return the set of match words occurring anywhere in lowercased `q`."""
+    if _AUTOMATON is not None:
+        return {term for _, term in _AUTOMATON.iter(q)}
+    found: set[str] = set()
+    for m in _WORD_RE.finditer(q):
+        found |= _CONTAINED_WORDS[m.group(1)]
+    return found
 
-    # Item count rule
-    elif in_q("how many", "how much", "items", "slots"):
-        return (
-            "You can place 1–5 items in the circle. Any mix is fine as long as total "
-            "base value hits your target threshold."
-        )
 
-    # Weapon-specific behavior and example combos
-    elif in_q("weapon", "weapons", "gun"):
-        if in_q("investigating") or ("higher" in q and "base" in q):
-            return (
-                "We're investigating why some weapons return higher base values in the circle; "
-                "weapon-specific values may apply."
-            )
-        else:
-            return (
-                "Weapons have special circle values; vendor-base math may not apply. "
-                "Durability can affect value, so totals can differ."
-            )
-    elif in_q("durability"):
-        return "Item durability can influence effective circle value, especially for weapons."
-    elif in_q("mp5sd", "slim diary"):
-        return (
-            "Reported combo: 2× MP5SD (~$900 total from Peacekeeper) + 1× Slim Diary (~40–50k₽) "
-            "can reach the 400k threshold due to weapon-specific values."
-        )
-    elif in_q("flash drive"):
-        return (
-            "Flash Drive may be a cheaper alternative to Slim Diary depending on market; "
-            "try 2× MP5SD + Diary/Flash Drive."
-        )
-    elif in_q("5x mp5", "5 x mp5", "five mp5", "mp5"):
-        return (
-            "Reported combo: 5× MP5 (Peacekeeper L1) can trigger 6/14h due to special weapon circle values."
-        )
-    elif in_q("g28", "labs access", "labs card"):
-        return (
-            "Reported combo: 1× G28 Patrol Rifle via barter (1 Labs Access Card, ~166k from Therapist) "
-            "can trigger 6/14h due to special weapon values."
-        )
+_TERM_RULES = _build_term_rules()
+if ahocorasick is not None:
+    _AUTOMATON = _build_automaton()
+else:
+    _AUTOMATON = None
+    _WORD_RE, _CONTAINED_WORDS = _build_word_regex()
 
-    # Features from Instructions
-    elif in_q("auto select", "autoselect"):
-        return "Auto Select finds the most cost-effective combo to hit your target (e.g., ≥400k) automatically."
-    elif in_q("pin"):
-        return "Pin locks chosen items so Auto Select must include them in the final combination."
-    elif in_q("override"):
-        return "Override lets you set custom flea prices when market differs from API data."
-    elif in_q("share"):
-        return "Share creates a compact code to save or send your selection to others."
-    elif in_q("red price", "unstable"):
-        return "Red price text = unstable flea price (low offer count at capture)."
-    elif in_q("yellow price", "manual"):
-        return "Yellow price text = price manually overridden by you."
-    elif in_q("exclude", "categories"):
-        return "Exclude categories you don't want to sacrifice to narrow results."
-    elif in_q("sort"):
-        return "Sort items by most recently updated or best value for rubles."
 
-    # PVP flea status and trader pricing
-    elif ("pvp" in q and "flea" in q) or in_q("flea disabled", "flea off"):
-        return (
-            "PVP: Flea is disabled. Use Settings → Price Mode: Trader, then set Trader Levels "
-            "to calculate trader-only prices."
-        )
-    elif in_q("trader price", "price mode", "trader levels"):
-        return (
-            "Switch Price Mode to Trader in Settings, then pick your Trader Levels (LL1–LL4) "
-            "to use trader-only prices."
-        )
-    elif in_q("hardcore", "l1 traders", "ll1") or ("level 1" in q and "trader" in q):
-        return (
-            "Hardcore PVP tip (LL1): 5× MP5 from Peacekeeper ≈ 400k+. Cost: $478 (~63,547₽) × 5 = $2,390 (~317,735₽)."
-        )
-    elif in_q("limitation", "wip", "work in progress", "quest locked"):
-        return "Trader pricing is work-in-progress: quest-locked items are currently included."
-    elif in_q("mode", "pve", "pvp"):
-        return "Toggle PVE/PVP to match the correct flea market for pricing/search."
-    elif in_q("tips", "strategy", "optimal"):
-        return (
-            "Aim slightly over 400k, use Auto Select, pin items you own, and ensure relevant quests are active for quest rewards."
-        )
-    elif in_q("discord", "discord server", "discord community"):
-        return (
-            "Join our Discord server for support, updates, and community discussion. https://discord.com/invite/3dFmr5qaJK"
-        )
+def _match_rule(found: set[str]) -> str | None:
+    """Return the id of the highest-priority rule whose words are all in `found`, or None."""
+    # The lowest matching row index wins
+    best = len(_RULES)
+    for term in found:
+        for idx in _TERM_RULES.get(term, ()):
+            if idx < best and all(r in found for r in _RULES[idx][2]):
+                best = idx
+                break  # indices are ascending per term
+    if best == len(_RULES):
+        return None
+    rule_id = _RULES[best][0]
+
+    if rule_id == "WEAPON":
+        investigating, higher, base = _WEAPON_HIGHER_TERMS
+        if investigating in found or (higher in found and base in found):
+            return "WEAPON_HIGHER"
+    return rule_id
+
+
+def _classify(question: str) -> tuple[str, int]:
+    """Return (answer, embed color) for a help question.
+
+    Normalizes once so casing/whitespace variants share a cache entry.
+    """
+    return _cached_answer_color(question.lower().strip())
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_answer_color(q: str) -> tuple[str, int]:
+    """Answer and color for an already-normalized question; repeat questions are a dict hit."""
+    found = _scan_words(q)
+
+    rule_id = _match_rule(found)
+    answer = _RESPONSES[rule_id] if rule_id is not None else _DEFAULT_RESPONSE
+
+    color = next((c for terms, c in _COLOR_RULES if any(t in found for t in terms)), _DEFAULT_COLOR)
+    return answer, color
 
-    # Calculator usage
-    elif in_q("calculator", "how to use", "use it", "help"):
-        return (
-            "Pick up to 5 items and check total base value: ≥350k for 14h (high tier) chance; ≥400k for 25% 6h (quest/hideout) / 75% 14h (high tier). "
-            "Base value uses vendor price ÷ multiplier."
-        )
-
-    # Default
-    return (
-        "Ask about thresholds (350k/400k), 6h/12h/14h chances, base value math (vendor ÷ trader multiplier), "
-        "PVE/PVP flea, item combos, Auto Select/Pin/Override/Share/Refresh, price indicators, excluding categories, sorting, tips, or Discord."
-    )
+
+def get_cultist_help_response(question: str) -> str:
+    """Return a short, canned explanation to a Cultist Circle help question.
+
+    Covers thresholds, base-value math, item combos, pricing modes, and features.
+
+    Args:
+        question: Raw user query.
+
+    Returns:
+        A single-paragraph response suitable for an embed description.
+    """
+    return _classify(question)[0]
 
 
 def _pick_color(question: str) -> int:
     """Pick an embed color based on the question topic cluster."""
-    q = question.lower()
-    if any(k in q for k in ("6h", "6-hour", "14h", "12h")):
-        return 0x9b59b6  # purple
-    if any(k in q for k in ("base value", "multiplier", "vendor")):
-        return 0x3498db  # blue
-    if any(k in q for k in ("weapon", "mp5", "g28")):
-        return 0xe67e22  # orange
-    return 0x2ecc71  # green default
+    return _classify(question)[1]
 
 
 def get_thresholds_table() -> str:
     """Return a formatted markdown table showing cultist circle thresholds."""
-    return (
-        "```\n"
-        "┌───────────────────┬──────────┬───────────────────────────────────────┐\n"
-        "│ Range (Value)     │ Time     │ Results                               │\n"
-        "├───────────────────┼──────────┼───────────────────────────────────────┤\n"
-        "│ 0 - 10,000        │ 2 hours  │ Normal value item                     │\n"
-        "│ 10,001 - 25,000   │ 3 hours  │ Normal value item                     │\n"
-        "│ 25,001 - 50,000   │ 4 hours  │ Normal value item                     │\n"
-        "│ 50,001 - 100,000  │ 5 hours  │ Normal value item                     │\n"
-        "│ 100,001 - 200,000 │ 8 hours  │ Normal value item                     │\n"
-        "│ 200,001 - 349,999 │ 12 hours │ Normal value item (guaranteed)        │\n"
-        "│ 350,000 - 399,999 │ 12h or   │ Normal (12h) or High tier (14h)       │\n"
-        "│                   │ 14 hours │                                       │\n"
-        "│ ≥ 400,000         │ 14h / 6h │ High tier (75%) / Quest-Hideout (25%) │\n"
-        "└───────────────────┴──────────┴───────────────────────────────────────┘\n"
-        "```"
-    )
+    return _THRESHOLDS_TABLE
 
 
 def build_cultist_help_embed(question: str) -> discord.Embed:
@@ -195,20 +309,15 @@ def build_cultist_help_embed(question: str) -> discord.Embed:
 
     Includes the original question and a loot tier legend for clarity.
     """
-    answer = get_cultist_help_response(question)
-    color = _pick_color(question)
+    answer, color = _classify(question)
 
     embed = discord.Embed(
         title="🕯️ Cultist Circle Help",
         description=answer,
         color=color,
-        timestamp=datetime.datetime.now(datetime.timezone.utc),
-    )
-    embed.add_field(name="Question", value=f"“{question}”", inline=False)
-    embed.add_field(
-        name="Loot tiers",
-        value="- 12h — normal loot\n- 14h — high tier loot\n- 6h — quest/hideout items",
-        inline=False,
+        timestamp=datetime.datetime.now(_UTC),
     )
+    embed.add_field(name="Question", value="“" + question + "”", inline=False)
+    embed.add_field(name="Loot tiers", value=_LOOT_TIERS_VALUE, inline=False)
     embed.set_footer(text="Cultist Calculator • Help")
     return embed
@@ -0,0 +1,104 @@
+# Numba-compiled DP kernels for cultist.py, which falls back to its NumPy
+# versions when Numba is missing. cache=True keeps compiled code on disk, so
+# only the first run after an install or code change pays the JIT cost.
+import numpy as np
+
+# Prefer Numba if installed to compile the DP kernels
+try:
+    from numba import njit  # type: ignore
+except Exception:  # ModuleNotFoundError or others
+    njit = None
+
+HAVE_NUMBA = njit is not None
+
+INF = 10**18
+
+
+def _kernel(fn):
+    """Compile a DP kernel with Numba when available, else return it unchanged.
+
+    Compiled kernels release the GIL, so callers can run them in worker threads.
+    """
+    if njit is None:
+        return fn
+    return njit(cache=True, boundscheck=False, nogil=True)(fn)
+
+
+@_kernel
+def dp_unbounded(vbs, costs, dp, prevV, prevI):
+    """Unbounded DP: dp[c][vb] = min cost of c items (repetition allowed) summing to bucket vb.
+
+    Tables are filled in place; dp[0][0] must already be 0 and every other cell INF.
+    """
+    K = len(dp) - 1
+    vb_max = len(dp[0]) - 1
+    n = len(vbs)
+    for ccount in range(1, K + 1):
+        base_prev = dp[ccount - 1]
+        row = dp[ccount]
+        for vb in range(0, vb_max + 1):
+            best_cost = row[vb]
+            best_prev_v = -1
+            best_prev_i = -1
+            for idx in range(n):
+                pv = vb - vbs[idx]
+                if pv < 0:
+                    continue
+                cost_prev = base_prev[pv]
+                if cost_prev == INF:
+                    continue
+                new_cost = cost_prev + costs[idx]
+                if new_cost < best_cost:
+                    best_cost = new_cost
+                    best_prev_v = pv
+                    best_prev_i = idx
+            if best_cost < row[vb]:
+                row[vb] = best_cost
+                prevV[ccount][vb] = best_prev_v
+                prevI[ccount][vb] = best_prev_i
+
+
+@_kernel
+def dp_bounded(unit_vbs, unit_costs, unit_mults, dp, prevV, prevU):
+    """0/1 DP over bundled units: each unit (mult copies of one item) is taken at most once.
+
+    Filled in place like dp_unbounded; a unit of mult m moves m item slots at once.
+    """
+    K = len(dp) - 1
+    vb_max = len(dp[0]) - 1
+    for u_idx in range(len(unit_vbs)):
+        ivb = unit_vbs[u_idx]
+        icost = unit_costs[u_idx]
+        take = unit_mults[u_idx]
+        for ccount in range(K, take - 1, -1):  # descending for 0/1
+            base_prev = dp[ccount - take]
+            row = dp[ccount]
+            for vb in range(vb_max, ivb - 1, -1):
+                pv = vb - ivb
+                if base_prev[pv] == INF:
+                    continue
+                new_cost = base_prev[pv] + icost
+                if new_cost < row[vb]:
+                    row[vb] = new_cost
+                    prevV[ccount][vb] = pv
+                    prevU[ccount][vb] = u_idx
+
+
+def warmup() -> None:
+    """Compile (or load from cache) both kernels for the dtypes the solver passes.
+
+    Blocking; call it from a worker thread at startup so the first /cultist
+    does not wait on the JIT.
+    """
+    if not HAVE_NUMBA:
+        return
+    dp = np.full((2, 2), INF, dtype=np.int64)
+    dp[0, 0] = 0
+    prevV = np.full_like(dp, -1, dtype=np.int32)
+    prevI = np.full_like(dp, -1, dtype=np.int32)
+    one32 = np.ones(1, dtype=np.int32)
+    dp_unbounded(one32, one32, dp, prevV, prevI)
+    # Randomized /cultist solves pass scaled int64 costs
+    dp_unbounded(one32, np.ones(1, dtype=np.int64), dp.copy(), prevV.copy(), prevI.copy())
+    one64 = np.ones(1, dtype=np.int64)
+    dp_bounded(one64, one64, one64, dp.copy(), prevV.copy(), prevI.copy())
@@ -1,20 +1,47 @@
-from typing import Final, Optional, Dict, List, Any, Union
+from typing import Final, Optional, Dict, List, Any, Tuple, Union
 import os
+import asyncio
+import heapq
+import time
+from bisect import bisect_right
+from itertools import accumulate
 from dotenv import load_dotenv
 from discord import Intents, app_commands
 import discord
 from discord.ext import commands
 import aiohttp
 import json
-import requests
 import ollama
 from cultist import compute_cultist_selection
-import datetime
+from cultist_numba import warmup as warm_cultist_kernels
+from price_search import (
+    CACHE_TTL_SECONDS as ITEMS_CACHE_TTL,
+    build_price_embed,
+    close_session as close_price_session,
+    fetch_items_data,
+    find_item,
+    format_roubles as _r,
+    format_roubles_bold as _br,
+    refresh_items_data,
+)
+from ammo_search import (
+    close_session as close_ammo_session,
+    fetch_ammo_data,
+    find_ammo,
+    format_ammo_embed as build_ammo_embed,
+)
+from datetime import datetime, timezone as tz
 from cultist_help import get_cultist_help_response as cultist_help_text, build_cultist_help_embed, get_thresholds_table
 import traceback
 from dataclasses import dataclass
 from typing import Optional
 
+# Prefer orjson if installed; fallback to stdlib json
+try:
+    import orjson  # type: ignore
+except Exception:  # ModuleNotFoundError or others
+    orjson = None
+
 # ----------------------------------------
 # COMMUNITY / PERPLEXICA DATA (example)
 # ----------------------------------------
@@ -34,7 +61,49 @@ load_dotenv()
 # ----------------------------------------
 TOKEN: Final[str] = os.getenv("DISCORD_TOKEN") or ""
 ENABLE_QUESTION_CLEANING = False
-OLLAMA_MODEL = "llama3.1:latest"  # Adjust to your local Ollama model
+# Adjust to your local Ollama models; 4-bit quantized tags roughly double tokens/s
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b-instruct-q4_K_M")
+# Grammar cleanup is trivial, so it runs on a much smaller model than the answers
+OLLAMA_CLEAN_MODEL = os.getenv("OLLAMA_CLEAN_MODEL", "qwen2.5:1.5b-instruct-q4_K_M")
+DEBUG = bool(os.getenv("DEBUG"))  # Verbose request/response logging
+# Discord allows 25 fields per embed; leave headroom. Characters and embed count are capped per message.
+EMBED_FIELD_LIMIT = 20
+EMBED_CHARS_LIMIT = 6000
+MESSAGE_EMBEDS_LIMIT = 10
+# Game-mode options; /cultist labels say which price each mode costs against
+CULTIST_MODE_CHOICES = [
+    app_commands.Choice(name="PvP (Trader cost)", value="pvp"),
+    app_commands.Choice(name="PvE (Flea cost)", value="pve"),
+]
+PRICE_MODE_CHOICES = [
+    app_commands.Choice(name="PvP", value="pvp"),
+    app_commands.Choice(name="PvE", value="pve"),
+]
+# /thresholds reply is static; fetched once here
+THRESHOLDS_TABLE: Final[str] = get_thresholds_table()
+# Async client for Ollama calls made from command handlers (None on old ollama releases)
+_OLLAMA_CLIENT = ollama.AsyncClient() if hasattr(ollama, "AsyncClient") else None
+
+# JSON codec for HTTP bodies: orjson when available. Loads takes the raw body bytes;
+# aiohttp's serializer must return str
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def json_pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+else:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+    def json_pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+
+# Every failure/not-found reply uses the same red embed
+def _err_embed(title: str, desc: str) -> discord.Embed:
+    return discord.Embed(title=title, description=desc, color=0xFF0000)
 
 # ----------------------------------------
 # ADDITIONAL DATACLASSES / STRUCTS
@@ -47,23 +116,102 @@ class ChatResponse:
 # ----------------------------------------
 # DISCORD BOT SETUP
 # ----------------------------------------
+class EFTBot(commands.Bot):
+    http_session: aiohttp.ClientSession
+
+    async def setup_hook(self) -> None:
+        # One pooled session for the bot's lifetime keeps DNS and keep-alive sockets warm
+        # Connect fails fast; the total cap stays loose because Perplexica answers can take a while
+        self.http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=120, sock_connect=10),
+            # Per-host cap so a burst of slow Perplexica searches cannot take every pooled socket
+            connector=aiohttp.TCPConnector(
+                limit=100, limit_per_host=30, ttl_dns_cache=300, keepalive_timeout=75
+            ),
+            cookie_jar=aiohttp.DummyCookieJar(),
+            json_serialize=json_dumps,
+        )
+        # Fill the items and ammo caches in the background so the first commands hit warm data
+        self._warm_task = asyncio.create_task(self.warm_caches())
+        # Refresh items ahead of expiry so /price, /base and /cultist never wait on a fetch
+        self._refresh_task = asyncio.create_task(self.refresh_items_loop())
+
+    async def warm_caches(self) -> None:
+        """Fetch items and ammo and compile the /cultist kernels concurrently; failures are logged, commands retry on demand."""
+        results = await asyncio.gather(
+            fetch_items_data(session=self.http_session),
+            fetch_ammo_data(session=self.http_session),
+            asyncio.to_thread(warm_cultist_kernels),
+            return_exceptions=True,
+        )
+        for label, result in zip(("items", "ammo", "cultist kernels"), results):
+            if isinstance(result, BaseException):
+                print(f"Cache warm-up failed for {label}: {result}")
+
+    async def refresh_items_loop(self) -> None:
+        """Refetch the items payload every half TTL; a failed refresh leaves the cache in place."""
+        while True:
+            await asyncio.sleep(ITEMS_CACHE_TTL / 2)
+            try:
+                if await refresh_items_data(session=self.http_session) is None:
+                    print("Background items refresh failed; keeping cached data")
+            except Exception as e:
+                print(f"Background items refresh error: {e}")
+
+    async def close(self) -> None:
+        # Stop the warm-up and refresh tasks, then release shared HTTP sessions before the event loop shuts down
+        tasks = [t for t in (getattr(self, "_warm_task", None), getattr(self, "_refresh_task", None)) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await close_ammo_session()
+        await close_price_session()
+        if getattr(self, "http_session", None) is not None:
+            await self.http_session.close()
+        await super().close()
+
 intents: Intents = Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = EFTBot(command_prefix="!", intents=intents)
+
+def chunk_lines(lines: List[str], limit: int) -> List[str]:
+    """Join lines into newline-separated blocks of at most `limit` chars.
+
+    A single line longer than `limit` still gets its own block.
+    """
+    if not lines:
+        return []
+    # Running lengths (line + newline) are built once; each block end is then one bisect
+    csum = list(accumulate(len(line) + 1 for line in lines))
+    blocks: List[str] = []
+    start, base = 0, 0
+    while start < len(lines):
+        end = max(bisect_right(csum, base + limit, start), start + 1)
+        blocks.append("\n".join(lines[start:end]))
+        start, base = end, csum[end - 1]
+    return blocks
+
+async def send_embeds(interaction: discord.Interaction, embeds: List[discord.Embed]) -> None:
+    """Send embeds as followups, packing as many per message as Discord's limits allow."""
+    batch: List[discord.Embed] = []
+    size = 0
+    for embed in embeds:
+        if batch and (len(batch) >= MESSAGE_EMBEDS_LIMIT or size + len(embed) > EMBED_CHARS_LIMIT):
+            await interaction.followup.send(embeds=batch)
+            batch, size = [], 0
+        batch.append(embed)
+        size += len(embed)
+    if batch:
+        await interaction.followup.send(embeds=batch)
 
 @bot.tree.command(name="cultist", description="Auto-select items to reach base value threshold with min total cost")
 @app_commands.describe(
     threshold="Target total base value in roubles (default: 400000)",
     max_items="Maximum number of items allowed (default: 5)",
     mode="Cost source: PvP (trader) or PvE (flea)",
-    randomize="Slightly randomize ties (shuffle candidates before DP)",
-)
-@app_commands.choices(
-    mode=[
-        app_commands.Choice(name="PvP (Trader cost)", value="pvp"),
-        app_commands.Choice(name="PvE (Flea cost)", value="pve"),
-    ]
+    randomize="Slightly randomize ties (random pick among equal-cost selections)",
 )
+@app_commands.choices(mode=CULTIST_MODE_CHOICES)
 async def cultist(
     interaction: discord.Interaction,
     threshold: int = 400000,
@@ -74,12 +222,18 @@ async def cultist(
     """Select up to max_items whose base value sum ≥ threshold minimizing total cost.
     Repetition allowed. PvP uses trader buy price (buyFor) with buyLimit, PvE uses flea.
     """
-    await interaction.response.defer()
-    from price_search import fetch_items_data
+    # Send the deferral while the items load; both must finish before any followup
+    deferred = asyncio.create_task(interaction.response.defer())
     selected_mode = (mode.value if mode else "pvp")
-    items_data = await fetch_items_data()
     try:
-        result = compute_cultist_selection(
+        items_data = await fetch_items_data(session=bot.http_session)
+    finally:
+        # Always collect the deferral, even if the fetch raises or is cancelled
+        await deferred
+    try:
+        # CPU-bound DP runs in a worker thread so gateway heartbeats keep flowing
+        result = await asyncio.to_thread(
+            compute_cultist_selection,
             items_data=items_data,
             threshold=threshold,
             max_items=max_items,
@@ -87,7 +241,7 @@ async def cultist(
             randomize=randomize,
         )
     except Exception as e:
-        await interaction.followup.send(f"Error: {e}")
+        await interaction.followup.send(embed=_err_embed("Cultist Selection Failed", str(e)))
         return
 
     sel_lines = result.get("sel_lines", [])
@@ -100,63 +254,70 @@ async def cultist(
     color = 0x2ecc71 if met else 0xe67e22  # green if met else orange
     status = "✅ Threshold met" if met else "⚠️ Threshold not met"
 
-    embed = discord.Embed(title="🕯️ Cultist Auto-Select", description=status, color=color)
-
-    # Summary fields
-    embed.add_field(name="Mode", value=mode_label, inline=True)
-    embed.add_field(name="Threshold", value=f"{threshold:,}₽", inline=True)
-    embed.add_field(name="Max items", value=str(max_items), inline=True)
-    embed.add_field(name="Total Value", value=f"{total_value:,}₽", inline=True)
-    embed.add_field(name="Total Cost", value=f"{total_cost:,}₽", inline=True)
+    # Summary fields are always present, so build the embed in one pass
+    embed = discord.Embed.from_dict({
+        "title": "🕯️ Cultist Auto-Select",
+        "description": status,
+        "color": color,
+        "fields": [
+            {"name": "Mode", "value": mode_label, "inline": True},
+            {"name": "Threshold", "value": _r(threshold), "inline": True},
+            {"name": "Max items", "value": str(max_items), "inline": True},
+            {"name": "Total Value", "value": _r(total_value), "inline": True},
+            {"name": "Total Cost", "value": _r(total_cost), "inline": True},
+        ],
+    })
 
     # Selection list (markdown; allow clickable links)
-    if sel_lines:
-        chunk: list[str] = []
-        current = 0
-        for line in sel_lines:
-            if current + len(line) + 1 > 1000 and chunk:
-                embed.add_field(name="Selection", value="\n".join(chunk), inline=False)
-                chunk = []
-                current = 0
-            chunk.append(line)
-            current += len(line) + 1
-        if chunk:
-            embed.add_field(name="Selection", value="\n".join(chunk), inline=False)
-
-    embed.set_footer(text="Data via Tarkov.dev")
+    selection_values = chunk_lines(sel_lines, 1000)
 
-    await interaction.followup.send(embed=embed)
+    # Long selections spill into continuation embeds instead of exceeding per-embed limits
+    footer = "Data via Tarkov.dev"
+    room = EMBED_CHARS_LIMIT - len(footer) - len("Selection")
+    embeds = [embed]
+    for value in selection_values:
+        if len(embeds[-1].fields) >= EMBED_FIELD_LIMIT or len(embeds[-1]) + len(value) > room:
+            embeds.append(discord.Embed(title="🕯️ Cultist Auto-Select (cont.)", color=color))
+        embeds[-1].add_field(name="Selection", value=value, inline=False)
+
+    embeds[-1].set_footer(text=footer)
+
+    await send_embeds(interaction, embeds)
 
 @bot.tree.command(name="bosschanges", description="Show the latest 3 boss spawn changes")
 async def bosschanges(interaction: discord.Interaction):
     """Fetch latest boss changes and display the newest 3 in an embed."""
-    from datetime import datetime, timezone as tz
-
-    await interaction.response.defer()
+    deferred = asyncio.create_task(interaction.response.defer())
 
     url = "https://bossdata.cultistcircle.workers.dev/changes"
+    error: Optional[str] = None
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    await interaction.followup.send(f"Error fetching boss changes: HTTP {resp.status}")
-                    return
-                data = await resp.json()
+        async with bot.http_session.get(url) as resp:
+            if resp.status != 200:
+                error = f"HTTP {resp.status}"
+            else:
+                data = json_loads(await resp.read())
     except Exception as e:
-        await interaction.followup.send(f"Error fetching boss changes: {e}")
+        error = str(e)
+    finally:
+        await deferred
+    if error is not None:
+        await interaction.followup.send(embed=_err_embed("Boss Changes Unavailable", error))
         return
 
     if not isinstance(data, list) or not data:
-        await interaction.followup.send("No boss changes found.")
+        await interaction.followup.send(embed=_err_embed("No Boss Changes", "No boss changes found."))
         return
 
     # Sort by timestamp desc and take latest 3
-    changes = sorted(data, key=lambda x: x.get("timestamp", 0), reverse=True)[:3]
+    changes = heapq.nlargest(3, data, key=lambda x: x.get("timestamp", 0))
+
+    # One clock read for every change rendered in this reply
+    now = datetime.now(tz.utc)
 
     def fmt_ago(ts_ms: int) -> str:
         try:
             dt = datetime.fromtimestamp(max(0, ts_ms) / 1000, tz=tz.utc)
-            now = datetime.now(tz.utc)
             delta = now - dt
             total_mins = int(delta.total_seconds() // 60)
             if total_mins < 1:
@@ -200,114 +361,28 @@ async def bosschanges(interaction: discord.Interaction):
     item_name="Name of the item to search for",
     mode="Choose PvP or PvE price data (default: PvP)",
 )
-@app_commands.choices(
-    mode=[
-        app_commands.Choice(name="PvP", value="pvp"),
-        app_commands.Choice(name="PvE", value="pve"),
-    ]
-)
+@app_commands.choices(mode=PRICE_MODE_CHOICES)
 async def price(interaction: discord.Interaction, item_name: str, mode: Optional[app_commands.Choice[str]] = None):
-    from price_search import fetch_items_data, find_item
-    from datetime import datetime, timezone as tz
-    
-    await interaction.response.defer()
-    items_data = await fetch_items_data()
+    deferred = asyncio.create_task(interaction.response.defer())
+    try:
+        items_data = await fetch_items_data(session=bot.http_session)
+    finally:
+        await deferred
     
     if not items_data:
-        await interaction.followup.send("Error: Could not fetch items data")
+        await interaction.followup.send(
+            embed=_err_embed("Items Data Unavailable", "Could not fetch items data")
+        )
         return
         
     item = find_item(items_data, item_name)
     if not item:
-        await interaction.followup.send(f"Could not find item matching '{item_name}'")
-        return
-
-    # Parse timestamps based on selected mode
-    current_dt = datetime.now(tz.utc)
-    selected_mode = (mode.value if mode else "pvp")
-    updated_iso = item.get("pveUpdated") if selected_mode == "pve" else item.get("updated")
-    last_mins: Optional[int] = None
-    if updated_iso:
-        dt_parsed = datetime.fromisoformat(updated_iso.replace("Z", "+00:00"))
-        last_mins = int((current_dt - dt_parsed).total_seconds() / 60)
-    
-    # Format time strings
-    def format_time(mins: Optional[int]) -> str:
-        if mins is None:
-            return "N/A"
-        hours = mins // 60
-        minutes = mins % 60
-        return f"{hours}h{minutes}m" if hours > 0 else f"{minutes}m"
-
-    # Create embed header (title + link + thumbnail)
-    link = item.get("link")
-    if link:
-        embed = discord.Embed(
-            title=item["name"],
-            color=0x2b2d31,
-            url=link,
-        )
-    else:
-        embed = discord.Embed(
-            title=item["name"],
-            color=0x2b2d31,
+        await interaction.followup.send(
+            embed=_err_embed("Item Not Found", f"Could not find item matching '{item_name}'")
         )
-    thumb = item.get("gridImageLink")
-    if thumb:
-        embed.set_thumbnail(url=thumb)
-
-    # Primary price block (two-column inline fields)
-    # Only show Flea when the selected mode actually has a flea price.
-    flea_price_raw = item.get('pvePrice') if selected_mode == 'pve' else item.get('price')
-    if flea_price_raw is not None:
-        embed.add_field(name="Flea Market Price", value=f"**{flea_price_raw:,}₽**", inline=True)
+        return
 
-    trader_price = item.get('traderSellPrice')
-    if trader_price is not None:
-        embed.add_field(name="Trader Buying Price", value=f"**{trader_price:,}₽**", inline=True)
-
-    # Price per slot (based on selected mode flea price)
-    w_raw = item.get('width')
-    h_raw = item.get('height')
-    def to_int(v: Any) -> Optional[int]:
-        try:
-            return int(v) if v is not None else None
-        except Exception:
-            return None
-    w = to_int(w_raw)
-    h = to_int(h_raw)
-    slots = (w * h) if (isinstance(w, int) and isinstance(h, int) and w > 0 and h > 0) else None
-    # Use selected mode flea for PPS; in PvP, if missing, fallback to trader price just for PPS.
-    pps_price = flea_price_raw
-    if pps_price is None and selected_mode == 'pvp':
-        tf = item.get('traderSellPrice')
-        if isinstance(tf, int):
-            pps_price = tf
-    if pps_price is not None and slots and slots > 0:
-        pps = int(round(pps_price / slots))
-        embed.add_field(name="Price Per Slot", value=f"{pps:,}₽", inline=True)
-
-    # Highlighted Base Price (yellow accent via emoji)
-    base_price = item.get('basePrice')
-    if base_price is not None:
-        embed.add_field(name="🟡 Base Price", value=f"**{base_price:,}₽**", inline=True)
-
-    # Secondary block
-    avg_24h = item.get('avg24hPrice')
-    if isinstance(avg_24h, int):
-        embed.add_field(name="24 Hour Price AVG", value=f"{avg_24h:,}₽", inline=True)
-
-    trader_name = item.get('traderSellName') or "Unknown Trader"
-    embed.add_field(name="Trader to sell to", value=trader_name, inline=True)
-
-    # Footer: last updated and attribution (fallback to other mode if missing)
-    if last_mins is None:
-        fallback_iso = item.get('updated') if selected_mode == 'pve' else item.get('pveUpdated')
-        if fallback_iso:
-            fb_dt = datetime.fromisoformat(fallback_iso.replace("Z", "+00:00"))
-            last_mins = int((current_dt - fb_dt).total_seconds() / 60)
-    updated_str = f"Last Updated: {format_time(last_mins)} ago" if last_mins is not None else "Last Updated: N/A"
-    embed.set_footer(text=f"{updated_str} - Data provided by Tarkov.dev")
+    embed = build_price_embed(item, mode.value if mode else "pvp")
 
     await interaction.followup.send(embed=embed)
 
@@ -316,18 +391,22 @@ async def price(interaction: discord.Interaction, item_name: str, mode: Optional
     item_name="Name of the item to search for",
 )
 async def base(interaction: discord.Interaction, item_name: str):
-    from price_search import fetch_items_data, find_item
-
-    await interaction.response.defer()
-
-    items_data = await fetch_items_data()
+    deferred = asyncio.create_task(interaction.response.defer())
+    try:
+        items_data = await fetch_items_data(session=bot.http_session)
+    finally:
+        await deferred
     if not items_data:
-        await interaction.followup.send("Error: Could not fetch items data")
+        await interaction.followup.send(
+            embed=_err_embed("Items Data Unavailable", "Could not fetch items data")
+        )
         return
 
     item = find_item(items_data, item_name)
     if not item:
-        await interaction.followup.send(f"Could not find item matching '{item_name}'")
+        await interaction.followup.send(
+            embed=_err_embed("Item Not Found", f"Could not find item matching '{item_name}'")
+        )
         return
 
     link = item.get("link")
@@ -348,7 +427,7 @@ async def base(interaction: discord.Interaction, item_name: str):
         embed.set_thumbnail(url=thumb)
 
     base_price = item.get("basePrice")
-    base_val = f"**{base_price:,}₽**" if isinstance(base_price, int) else "N/A"
+    base_val = _br(base_price) if isinstance(base_price, int) else "N/A"
     embed.add_field(name="Base Value", value=base_val, inline=False)
 
     await interaction.followup.send(embed=embed)
@@ -399,30 +478,21 @@ async def base(interaction: discord.Interaction, item_name: str):
 @bot.tree.command(name="ammo", description="Look up information about ammunition types")
 async def ammo(interaction: discord.Interaction, name: str):
     """Look up information about ammunition types using GraphQL data"""
-    await interaction.response.defer()
-
-    # Import here to keep related code localized to the ammo section
-    from ammo_search import fetch_ammo_data, find_ammo, format_ammo_embed as build_ammo_embed
-
-    data = await fetch_ammo_data()
+    deferred = asyncio.create_task(interaction.response.defer())
+    try:
+        data = await fetch_ammo_data(session=bot.http_session)
+    finally:
+        await deferred
     if not data or not data.get("ammo"):
         await interaction.followup.send(
-            embed=discord.Embed(
-                title="Ammo Data Unavailable",
-                description="Couldn't fetch ammo data. Please try again later.",
-                color=0xFF0000,
-            )
+            embed=_err_embed("Ammo Data Unavailable", "Couldn't fetch ammo data. Please try again later.")
         )
         return
 
     entry = find_ammo(data, name)
     if not entry:
         await interaction.followup.send(
-            embed=discord.Embed(
-                title="Ammo Not Found",
-                description=f"No ammunition found matching '{name}'",
-                color=0xFF0000,
-            )
+            embed=_err_embed("Ammo Not Found", f"No ammunition found matching '{name}'")
         )
         return
 
@@ -446,7 +516,7 @@ async def get_ai_response(prompt: str) -> Union[ChatResponse, str]:
 # NEW PERPLEXICA / OLLAMA FUNCTIONS
 # ----------------------------------------
 def format_time_context() -> str:
-    current_datetime = datetime.datetime.now()
+    current_datetime = datetime.now()
     date_str = current_datetime.strftime("%Y-%m-%d %H:%M:%S")
     return (
         f"TIME CONTEXT:\n"
@@ -484,12 +554,12 @@ async def get_concise_response(
 ) -> ChatResponse:
     try:
         # Get response from Ollama
-        response = await ollama.chat(
+        response = await _ollama_chat(
             model=OLLAMA_MODEL,
             messages=[{"role": "user", "content": long_answer}]
         )
         
-        answer = response.messages[-1].content.strip()
+        answer = response["message"]["content"].strip()
         
         # Get source URL if available
         source_url = None
@@ -513,9 +583,18 @@ async def get_concise_response(
         return ChatResponse(content="I encountered an error while processing your question.", error=error_msg)
 
 
-def clean_question_with_ollama(question: str) -> str:
+async def _ollama_chat(**kwargs: Any) -> Any:
+    """Chat with Ollama without blocking the event loop."""
+    if _OLLAMA_CLIENT is not None:
+        return await _OLLAMA_CLIENT.chat(**kwargs)
+    # Older ollama releases have no AsyncClient; run the sync call in a worker thread
+    return await asyncio.to_thread(ollama.chat, **kwargs)
+
+
+async def clean_question_with_ollama(question: str) -> str:
     if not ENABLE_QUESTION_CLEANING:
-        print("Question cleaning disabled, using original:", question)
+        if DEBUG:
+            print("Question cleaning disabled, using original:", question)
         return question
 
     try:
@@ -525,7 +604,7 @@ def clean_question_with_ollama(question: str) -> str:
             f"Clean this question: '{question}'\n"
             f"Return ONLY the cleaned question."
         )
-        response = ollama.chat(model=OLLAMA_MODEL, messages=[{"role": "user", "content": prompt}])
+        response = await _ollama_chat(model=OLLAMA_CLEAN_MODEL, messages=[{"role": "user", "content": prompt}])
         cleaned = response["message"]["content"].strip().strip("\"'")
         print("Question cleaned:", cleaned)
         return cleaned
@@ -534,13 +613,50 @@ def clean_question_with_ollama(question: str) -> str:
         return question
 
 
+# Successful Perplexica answers keyed by normalized question, as (monotonic ts, response), oldest first
+_AI_CACHE: Dict[str, Tuple[float, ChatResponse]] = {}
+_AI_CACHE_TTL = 1800  # 30 minutes
+_AI_CACHE_SIZE = 512
+
+
+def _ai_cache_key(query: str) -> str:
+    # Case and whitespace differences should not trigger a new LLM round-trip
+    return " ".join(query.lower().split())
+
+
+def _ai_cache_get(key: str) -> Optional[ChatResponse]:
+    hit = _AI_CACHE.get(key)
+    if hit is None:
+        return None
+    if time.monotonic() - hit[0] >= _AI_CACHE_TTL:
+        del _AI_CACHE[key]
+        return None
+    return hit[1]
+
+
+def _ai_cache_put(key: str, response: ChatResponse) -> None:
+    _AI_CACHE.pop(key, None)
+    if len(_AI_CACHE) >= _AI_CACHE_SIZE:
+        _AI_CACHE.pop(next(iter(_AI_CACHE)))
+    _AI_CACHE[key] = (time.monotonic(), response)
+
+
 async def search_perplexica(
     query: str, history: Optional[List[Dict[str, Any]]] = None
 ) -> Union[str, ChatResponse]:
     """
     Sends query to Perplexica, which returns a structure with 'message' and 'sources'.
+
+    Answers to history-free questions are cached for _AI_CACHE_TTL seconds.
     """
-    cleaned_query = clean_question_with_ollama(query)
+    # Follow-ups depend on the conversation, so only standalone questions are cached
+    cache_key = _ai_cache_key(query) if not history else None
+    if cache_key is not None:
+        cached = _ai_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+    cleaned_query = await clean_question_with_ollama(query) if ENABLE_QUESTION_CLEANING else query
     url = "http://localhost:3001/api/search"  # Adjust if needed
 
     payload = {
@@ -553,35 +669,39 @@ async def search_perplexica(
     }
 
     try:
-        print(f"[Perplexica] Sending request for query: {cleaned_query}")
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url, headers={"Content-Type": "application/json"}, json=payload
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"[Perplexica] HTTP error {response.status}: {error_text}")
-                    return ChatResponse(error=f"HTTP error occurred: {response.status}")
-
-                data = await response.json()
-                print(f"[Perplexica] Received response: {json.dumps(data, indent=2)}")
-
-                if not data or "message" not in data:
-                    print("[Perplexica] Invalid response format")
-                    return ChatResponse(error="Invalid response from AI service")
-
-                # Extract the main text and format it
-                message = data.get("message", "No message returned.")
-                sources = data.get("sources", [])
+        if DEBUG:
+            print(f"[Perplexica] Sending request for query: {cleaned_query}")
+        async with bot.http_session.post(
+            url, headers={"Content-Type": "application/json"}, json=payload
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                print(f"[Perplexica] HTTP error {response.status}: {error_text}")
+                return ChatResponse(error=f"HTTP error occurred: {response.status}")
+
+            data = json_loads(await response.read())
+            if DEBUG:
+                print(f"[Perplexica] Received response: {json_pretty(data)}")
+
+            if not data or "message" not in data:
+                print("[Perplexica] Invalid response format")
+                return ChatResponse(error="Invalid response from AI service")
+
+            # Extract the main text and format it
+            message = data.get("message", "No message returned.")
+            sources = data.get("sources", [])
                 
-                # Get the first source URL if available
-                source_url = None
-                if sources and len(sources) > 0 and "url" in sources[0]["metadata"]:
-                    source_url = sources[0]["metadata"]["url"]
+            # Get the first source URL if available
+            source_url = None
+            if sources and len(sources) > 0 and "url" in sources[0]["metadata"]:
+                source_url = sources[0]["metadata"]["url"]
                 
-                # Format the response with source attribution if available
-                formatted_response = format_qa_response(message, source_url)
-                return ChatResponse(content=formatted_response)
+            # Format the response with source attribution if available
+            formatted_response = format_qa_response(message, source_url)
+            result = ChatResponse(content=formatted_response)
+            if cache_key is not None:
+                _ai_cache_put(cache_key, result)
+            return result
 
     except aiohttp.ClientError as e:
         print(f"[Perplexica] Network error: {str(e)}")
@@ -619,9 +739,7 @@ async def help(interaction: discord.Interaction, question: str):
 @bot.tree.command(name="thresholds", description="Display Cultist Circle value thresholds and timing table")
 async def thresholds(interaction: discord.Interaction):
     """Display a comprehensive table of Cultist Circle value thresholds and their corresponding timings."""
-    table = get_thresholds_table()
-    
-    await interaction.response.send_message(table, ephemeral=False)
+    await interaction.response.send_message(THRESHOLDS_TABLE, ephemeral=False)
 
 # ----------------------------------------
 # DISCORD BOT EVENTS
@@ -1,39 +1,151 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+import asyncio
+import bisect
+import functools
+import hashlib
 import aiohttp
 from datetime import datetime, timezone as tz
 import os
+import sys
 import json
+import time
+import discord
 
-# Prefer fuzzywuzzy if installed; fallback to stdlib difflib
+# Optional fuzzy match: prefer RapidFuzz if installed; fallback to difflib
 try:
-    from fuzzywuzzy import process as fw_process  # type: ignore
+    from rapidfuzz import fuzz, process as rf_process, utils as rf_utils  # type: ignore
 except Exception:  # ModuleNotFoundError or others
-    fw_process = None
+    rf_process = None
     import difflib
 
+# Prefer orjson if installed; fallback to stdlib json
+try:
+    import orjson  # type: ignore
+except Exception:  # ModuleNotFoundError or others
+    orjson = None
+
+# Prefer ciso8601 if installed (C parser, takes the trailing "Z" as-is); fallback to fromisoformat
+try:
+    from ciso8601 import parse_datetime as _parse_iso  # type: ignore
+except Exception:  # ModuleNotFoundError or others
+    _parse_iso = None
+
+# Both accept bytes, so the response body is parsed without a str decode
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 # Cache configuration
 CACHE_FILE = os.path.join(os.path.dirname(__file__), "items_cache.json")
 CACHE_TTL_SECONDS = 600  # 10 minutes
 
+# Last parsed cache file as (mtime, result), so fresh hits skip the disk read and JSON parse
+_MEM_CACHE: Optional[Tuple[float, Dict[str, Any]]] = None
+
+# Digest of the last GraphQL body turned into _MEM_CACHE; an identical refetch skips the rebuild
+_BODY_DIGEST: Optional[bytes] = None
 
-async def fetch_items_data() -> Optional[Dict[str, Any]]:
+# Shared HTTP session for GraphQL refreshes, created lazily so keep-alive sockets are reused
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+# Held while refreshing from the API so a burst of commands shares one fetch
+_FETCH_LOCK = asyncio.Lock()
+
+# Name lookup tables for the current items payload, keyed by its fetchedAt stamp
+_INDEX_CACHE: Dict[str, "_ItemIndex"] = {}
+
+# Shortest query that may resolve by name prefix instead of fuzzy scoring
+_MIN_PREFIX_LEN = 3
+
+# Distinct queries remembered per payload before the memo is reset
+_RESULT_MEMO_SIZE = 512
+
+
+async def fetch_items_data(session: Optional[aiohttp.ClientSession] = None) -> Optional[Dict[str, Any]]:
     """
     Fetch items from the GraphQL API and write to a cache file.
 
+    Pass the bot's shared `session` to reuse its connection pool; otherwise a
+    module-level one is used.
+
     Returns a dict with shape: { "items": [...], "fetchedAt": iso_string }
     """
     # 1) Serve fresh cache when available
+    cached = await _load_fresh_cache()
+    if cached is not None:
+        return cached
+
+    # 2) Single-flight refresh: concurrent callers wait for one fetch instead of stampeding
+    async with _FETCH_LOCK:
+        cached = await _load_fresh_cache()  # another caller may have refreshed while we waited
+        if cached is not None:
+            return cached
+        return await _fetch_and_cache(session)
+
+
+async def refresh_items_data(session: Optional[aiohttp.ClientSession] = None) -> Optional[Dict[str, Any]]:
+    """Refetch items even if the cache is still fresh; None (cache kept) on failure."""
+    async with _FETCH_LOCK:
+        return await _fetch_and_cache(session)
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Return the shared session, (re)creating it if missing or closed."""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        # Same timeouts as the bot's session, so a stalled request can't hold _FETCH_LOCK forever
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=120, sock_connect=10),
+        )
+    return _SESSION
+
+
+async def close_session() -> None:
+    """Close the shared session; call on bot shutdown."""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+
+def _read_cache_file() -> Dict[str, Any]:
+    with open(CACHE_FILE, "rb") as f:
+        raw = f.read()
+    cached = _json_loads(raw)
+    _intern_vendor_names(cached.get("items") or [])
+    return cached
+
+
+def _write_cache_file(result: Dict[str, Any]) -> None:
+    if orjson is not None:
+        raw = orjson.dumps(result)
+    else:
+        raw = json.dumps(result, ensure_ascii=False).encode("utf-8")
+    with open(CACHE_FILE, "wb") as f:
+        f.write(raw)
+
+
+async def _load_fresh_cache() -> Optional[Dict[str, Any]]:
+    """Return the cached payload if the cache file is within TTL, from memory when unchanged."""
+    global _MEM_CACHE
     try:
         if os.path.exists(CACHE_FILE):
             mtime = os.path.getmtime(CACHE_FILE)
             if (datetime.now(tz.utc).timestamp() - mtime) < CACHE_TTL_SECONDS:
-                with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                if _MEM_CACHE is not None and _MEM_CACHE[0] == mtime:
+                    return _MEM_CACHE[1]
+                # File I/O and the multi-MB parse run in a worker thread so the event loop isn't blocked
+                cached = await asyncio.to_thread(_read_cache_file)
+                _MEM_CACHE = (mtime, cached)
+                return cached
     except Exception as e:
         print(f"Cache read error: {e}")
+    return None
+
 
-    # 2) Fetch from GraphQL and rebuild cache
+async def _fetch_and_cache(session: Optional[aiohttp.ClientSession]) -> Optional[Dict[str, Any]]:
+    """Fetch from GraphQL and rebuild the cache file."""
+    global _MEM_CACHE, _BODY_DIGEST
     url = "https://api.tarkov.dev/graphql"
     query = """
     {
@@ -68,230 +180,374 @@ async def fetch_items_data() -> Optional[Dict[str, Any]]:
       }
       pveItems: items(gameMode: pve) {
         id
-        name
-        shortName
         lastLowPrice
-        avg24hPrice
-        basePrice
-        gridImageLink
-        link
-        width
-        height
-        sellFor {
-          vendor {
-            name
-          }
-          priceRUB
-        }
-        buyFor {
-          priceRUB
-          vendor {
-            normalizedName
-            ... on TraderOffer {
-              minTraderLevel
-              buyLimit
-            }
-          }
-        }
         updated
       }
     }
     """
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json={"query": query}) as response:
-                if response.status != 200:
-                    print(f"GraphQL error: HTTP {response.status}")
-                    return None
-                payload = await response.json()
-
-        data = payload.get("data", {})
-        pvp_items = data.get("pvpItems", [])
-        pve_items = data.get("pveItems", [])
-
-        # Build lookup by id for PvP, then enrich with PvE
-        by_id: Dict[str, Dict[str, Any]] = {}
-
-        def best_vendor(sell_for: Optional[list]) -> Optional[Dict[str, Any]]:
-            if not sell_for:
+        if session is None:
+            session = await _get_session()
+        async with session.post(url, json={"query": query}) as response:
+            if response.status != 200:
+                print(f"GraphQL error: HTTP {response.status}")
                 return None
-            best = max(sell_for, key=lambda s: (s.get("priceRUB") or 0))
-            return {
-                "traderSellPrice": best.get("priceRUB"),
-                "traderSellName": (best.get("vendor") or {}).get("name")
-            }
+            raw = await response.read()
+
+        # Unchanged upstream: keep the parsed payload (and its fetchedAt, so indexes stay warm)
+        # and only renew the cache file's TTL
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        if digest == _BODY_DIGEST and _MEM_CACHE is not None:
+            cached = _MEM_CACHE[1]
+            try:
+                await asyncio.to_thread(os.utime, CACHE_FILE)
+                _MEM_CACHE = (os.path.getmtime(CACHE_FILE), cached)
+                return cached
+            except Exception as e:
+                # e.g. the file was deleted: rebuild and rewrite it below rather than
+                # leaving the TTL expired and hitting this branch on every call
+                print(f"Cache touch error: {e}")
+                _BODY_DIGEST = None
+
+        # Parsing and reshaping a multi-MB body is CPU-bound; keep it off the event loop
+        result = await asyncio.to_thread(_build_items_result, raw)
 
-        def best_trader_buy(buy_for: Optional[list]) -> Optional[Dict[str, Any]]:
-            """Pick the cheapest trader offer from buyFor (exclude flea/other offers)."""
-            if not buy_for:
-                return None
-            candidates = []
+        try:
+            await asyncio.to_thread(_write_cache_file, result)
+            _MEM_CACHE = (os.path.getmtime(CACHE_FILE), result)
+            _BODY_DIGEST = digest
+        except Exception as e:
+            print(f"Cache write error: {e}")
+
+        return result
+    except Exception as e:
+        print(f"Error fetching items data: {e}")
+        return None
+
+
+def _intern(value: Any) -> Any:
+    """sys.intern for strings; the handful of trader names then share one object across items."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_vendor_names(items: List[Dict[str, Any]]) -> None:
+    for item in items:
+        for key in ("traderSellName", "traderBuyVendor"):
+            if key in item:
+                item[key] = _intern(item[key])
+
+
+def _build_items_result(raw: bytes) -> Dict[str, Any]:
+    """Parse a GraphQL items body into the cached { "items": [...], "fetchedAt": ... } shape."""
+    payload = _json_loads(raw)
+    data = payload.get("data", {})
+    pvp_items = data.get("pvpItems", [])
+    pve_items = data.get("pveItems", [])
+
+    # Build lookup by id for PvP, then enrich with PvE (only price and timestamp are queried)
+    by_id: Dict[str, Dict[str, Any]] = {}
+
+    # Best sell/cheapest trader buy are tracked inline: no per-item closures or key lambdas
+    for it in pvp_items:
+        get = it.get
+        iid = get("id")
+        entry: Dict[str, Any] = {
+            "id": iid,
+            "name": get("name"),
+            "shortName": get("shortName"),
+            # PvP flea
+            "price": get("lastLowPrice"),
+            "avg24hPrice": get("avg24hPrice"),
+            # Base and updated
+            "basePrice": get("basePrice"),
+            "updated": get("updated"),
+            # Media and links
+            "gridImageLink": get("gridImageLink"),
+            "link": get("link"),
+            # Size
+            "width": get("width"),
+            "height": get("height"),
+        }
+
+        sell_for = get("sellFor")
+        if sell_for:
+            best_s = sell_for[0]
+            best_p = best_s.get("priceRUB") or 0
+            for sf in sell_for:
+                p = sf.get("priceRUB") or 0
+                if p > best_p:
+                    best_p = p
+                    best_s = sf
+            entry["traderSellPrice"] = best_s.get("priceRUB")
+            entry["traderSellName"] = _intern((best_s.get("vendor") or {}).get("name"))
+
+        buy_for = get("buyFor")
+        if buy_for:
+            best_vendor = None
+            best_b = 0
             for bf in buy_for:
-                vendor = (bf.get("vendor") or {})
                 price = bf.get("priceRUB")
                 # Only consider trader offers (fragment provides these fields)
                 if not isinstance(price, int) or price <= 0:
                     continue
+                if best_vendor is not None and price >= best_b:
+                    continue
+                vendor = (bf.get("vendor") or {})
                 if "minTraderLevel" not in vendor and "buyLimit" not in vendor:
                     # Likely non-trader (e.g., flea). Skip for PvP trader pricing.
                     continue
-                candidates.append({
-                    "price": price,
-                    "vendor": vendor.get("normalizedName"),
-                    "minLevel": vendor.get("minTraderLevel"),
-                    "buyLimit": vendor.get("buyLimit"),
-                })
-            if not candidates:
-                return None
-            best_b = min(candidates, key=lambda c: c["price"])  # cheapest trader buy price
-            return {
-                "traderBuyPrice": best_b["price"],
-                "traderBuyVendor": best_b["vendor"],
-                "traderMinLevel": best_b["minLevel"],
-                "traderBuyLimit": best_b["buyLimit"],
-            }
+                best_b = price
+                best_vendor = vendor
+            if best_vendor is not None:
+                # cheapest trader buy price
+                entry["traderBuyPrice"] = best_b
+                entry["traderBuyVendor"] = _intern(best_vendor.get("normalizedName"))
+                entry["traderMinLevel"] = best_vendor.get("minTraderLevel")
+                entry["traderBuyLimit"] = best_vendor.get("buyLimit")
+        by_id[iid] = entry
+
+    for it in pve_items:
+        eid = it.get("id")
+        tgt = by_id.get(eid)
+        if tgt is None:
+            # Every PvE item also exists in PvP, so an unmatched id has nothing to enrich
+            continue
+        tgt["pvePrice"] = it.get("lastLowPrice")
+        tgt["pveUpdated"] = it.get("updated")
+
+    items_list = list(by_id.values())
+    return {
+        "items": items_list,
+        "fetchedAt": datetime.now(tz.utc).isoformat()
+    }
 
-        for it in pvp_items:
-            entry: Dict[str, Any] = {
-                "id": it.get("id"),
-                "name": it.get("name"),
-                "shortName": it.get("shortName"),
-                # PvP flea
-                "price": it.get("lastLowPrice"),
-                "avg24hPrice": it.get("avg24hPrice"),
-                # Base and updated
-                "basePrice": it.get("basePrice"),
-                "updated": it.get("updated"),
-                # Media and links
-                "gridImageLink": it.get("gridImageLink"),
-                "link": it.get("link"),
-                # Size
-                "width": it.get("width"),
-                "height": it.get("height"),
-            }
-            bv = best_vendor(it.get("sellFor"))
-            if bv:
-                entry.update(bv)
-            bt = best_trader_buy(it.get("buyFor"))
-            if bt:
-                entry.update(bt)
-            by_id[it.get("id")] = entry
-
-        for it in pve_items:
-            eid = it.get("id")
-            tgt = by_id.get(eid)
-            if tgt is None:
-                tgt = {
-                    "id": it.get("id"),
-                    "name": it.get("name"),
-                    "shortName": it.get("shortName"),
-                    "basePrice": it.get("basePrice"),
-                    "gridImageLink": it.get("gridImageLink"),
-                    "link": it.get("link"),
-                    "width": it.get("width"),
-                    "height": it.get("height"),
-                }
-                by_id[eid] = tgt
-            tgt["pvePrice"] = it.get("lastLowPrice")
-            tgt["pveUpdated"] = it.get("updated")
-
-        items_list = list(by_id.values())
-        result = {
-            "items": items_list,
-            "fetchedAt": datetime.now(tz.utc).isoformat()
-        }
 
-        try:
-            with open(CACHE_FILE, "w", encoding="utf-8") as f:
-                json.dump(result, f, ensure_ascii=False)
-        except Exception as e:
-            print(f"Cache write error: {e}")
+class _ItemIndex(NamedTuple):
+    name_matches: Dict[str, Dict[str, Any]]  # lowercased name -> item
+    shortname_matches: Dict[str, Dict[str, Any]]  # lowercased shortName -> item
+    sorted_names: List[str]  # name_matches keys, sorted for bisect prefix lookups
+    results: Dict[str, Optional[Dict[str, Any]]]  # lowercased query -> find_item result
+    fuzzy_keys: List[str]  # name keys then shortName keys, scored in one fuzzy pass
+    fuzzy_items: List[Dict[str, Any]]  # item for each fuzzy_keys entry
+    bigrams: Dict[str, List[int]]  # 2-gram -> ascending fuzzy_keys positions containing it
 
-        return result
-    except Exception as e:
-        print(f"Error fetching items data: {e}")
+
+def _item_slots(item: Dict[str, Any]) -> Optional[int]:
+    """Inventory slots taken by the item (width * height), None when unknown."""
+    try:
+        w = int(item.get("width") or 0)
+        h = int(item.get("height") or 0)
+    except (TypeError, ValueError):
         return None
+    return (w * h) if (w > 0 and h > 0) else None
 
 
-def find_item(items_data: Dict[str, Any], search_term: str) -> Optional[Dict[str, Any]]:
-    """Find item using fuzzy matching on both name and shortName"""
-    if not items_data or "items" not in items_data:
+def _iso_ts(value: Any) -> Optional[float]:
+    """Epoch seconds for a tarkov.dev ISO stamp ("...Z"), None when missing or malformed."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        if _parse_iso is not None:
+            return _parse_iso(value).timestamp()
+        return datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value).timestamp()
+    except ValueError:
         return None
 
+
+def _build_item_index(items_data: Dict[str, Any]) -> _ItemIndex:
     # Create dictionaries for both name and shortName matches
     name_matches = {}
     shortname_matches = {}
 
     for item in items_data["items"]:
         name_matches[item["name"].lower()] = item
+        # Grid size and update stamps never change per payload; derive them once here for /price
+        item["_slots"] = _item_slots(item)
+        item["_updated_ts"] = _iso_ts(item.get("updated"))
+        item["_pve_updated_ts"] = _iso_ts(item.get("pveUpdated"))
         # Some items might not have shortName, so we check first
         if "shortName" in item and item["shortName"]:
             shortname_matches[item["shortName"].lower()] = item
 
-    # Try matching against both name and shortName
-    if fw_process is not None:
-        name_match = fw_process.extractOne(search_term.lower(), name_matches.keys())
-        shortname_match = fw_process.extractOne(search_term.lower(), shortname_matches.keys())
-    else:
-        # difflib fallback: emulate (string, score) where score is 0-100
-        def best_match_dict(query: str, pool: Dict[str, Any]):
-            if not pool:
-                return None
-            choices = list(pool.keys())
-            best = None
-            best_score = -1.0
-            for choice in choices:
-                score = difflib.SequenceMatcher(a=query, b=choice).ratio()
-                if score > best_score:
-                    best_score = score
-                    best = choice
-            # Convert 0..1 to 0..100 like fuzzywuzzy
-            return (best, int(round(best_score * 100))) if best is not None else None
+    # Names come first so the first-best pick keeps names winning score ties
+    fuzzy_keys = list(name_matches) + list(shortname_matches)
+    fuzzy_items = list(name_matches.values()) + list(shortname_matches.values())
+    bigrams: Dict[str, List[int]] = {}
+    for pos, key in enumerate(fuzzy_keys):
+        for gram in _bigrams(key):
+            bigrams.setdefault(gram, []).append(pos)
+    return _ItemIndex(
+        name_matches, shortname_matches, sorted(name_matches), {}, fuzzy_keys, fuzzy_items, bigrams
+    )
+
+
+def _bigrams(text: str) -> set:
+    """Distinct 2-character slices within each word of `text` (punctuation ignored)."""
+    if rf_process is not None:
+        text = rf_utils.default_process(text)
+    return {word[i:i + 2] for word in text.split() for i in range(len(word) - 1)}
+
+
+def _fuzzy_candidates(index: _ItemIndex, query: str) -> Optional[List[int]]:
+    """Positions of the fuzzy keys sharing a bigram with `query`, in key order.
+
+    None means no prefilter applies (query too short, or most keys hit) and every key is scored
+    in one pass.
+    """
+    grams = _bigrams(query)
+    if not grams:
+        return None
+    postings = index.bigrams
+    hits: set = set()
+    for gram in grams:
+        hits.update(postings.get(gram, ()))
+    if len(hits) * 2 > len(index.fuzzy_keys):
+        return None
+    # Score survivors in key order so ties among them still go to the first key
+    return sorted(hits)
+
 
-        name_match = best_match_dict(search_term.lower(), name_matches)
-        shortname_match = best_match_dict(search_term.lower(), shortname_matches)
+def _get_item_index(items_data: Dict[str, Any]) -> _ItemIndex:
+    """Return the lookup tables for this payload, built once per fetchedAt."""
+    version = items_data.get("fetchedAt")
+    if version and version in _INDEX_CACHE:
+        return _INDEX_CACHE[version]
 
-    # Compare the match scores and take the better one
-    best_match = None
-    best_score = 0
+    index = _build_item_index(items_data)
+    if version:
+        # Only the latest payload is ever searched; drop tables for older ones
+        _INDEX_CACHE.clear()
+        _INDEX_CACHE[version] = index
+    return index
 
-    if name_match and name_match[1] >= 80:
-        best_match = name_matches[name_match[0]]
-        best_score = name_match[1]
 
-    if shortname_match and shortname_match[1] >= 80:
-        if shortname_match[1] > best_score:
-            best_match = shortname_matches[shortname_match[0]]
+def _prefix_match(query: str, sorted_names: List[str]) -> Optional[str]:
+    """Shortest name starting with `query` (alphabetical on ties), or None."""
+    pos = bisect.bisect_left(sorted_names, query)
+    best = None
+    while pos < len(sorted_names) and sorted_names[pos].startswith(query):
+        if best is None or len(sorted_names[pos]) < len(best):
+            best = sorted_names[pos]
+        pos += 1
+    return best
 
-    return best_match
+
+def find_item(items_data: Dict[str, Any], search_term: str) -> Optional[Dict[str, Any]]:
+    """Find item using fuzzy matching on both name and shortName"""
+    if not items_data or "items" not in items_data:
+        return None
+
+    index = _get_item_index(items_data)
+    query = search_term.lower()
+
+    # Repeat searches against the same payload skip matching; a new index starts empty
+    results = index.results
+    if query in results:
+        return results[query]
+    if len(results) >= _RESULT_MEMO_SIZE:
+        results.clear()
+    item = _match_item(index, query)
+    results[query] = item
+    return item
+
+
+def _match_item(index: _ItemIndex, query: str) -> Optional[Dict[str, Any]]:
+    """Exact, prefix, then fuzzy lookup of an already-lowercased query."""
+    name_matches = index.name_matches
+    shortname_matches = index.shortname_matches
+
+    # Exact name, then exact shortName (names win ties, as with fuzzy scores)
+    exact = name_matches.get(query) or shortname_matches.get(query)
+    if exact is not None:
+        return exact
+
+    # Unambiguous-enough prefixes resolve without fuzzy scoring
+    if len(query) >= _MIN_PREFIX_LEN:
+        prefix = _prefix_match(query, index.sorted_names)
+        if prefix is not None:
+            return name_matches[prefix]
+
+    # Score the bigram-overlap survivors first: their best sets the bar the remaining keys
+    # must reach, which lets the second pass prune harder but still scores every key, so the
+    # result (first best key wins) is the same as a single pass
+    candidates = _fuzzy_candidates(index, query)
+    if candidates is None:
+        best = _fuzzy_pick(index, query, None)
+    else:
+        best = _fuzzy_pick(index, query, candidates)
+        scored = set(candidates)
+        rest = [pos for pos in range(len(index.fuzzy_keys)) if pos not in scored]
+        other = _fuzzy_pick(index, query, rest, best[0] if best else None) if rest else None
+        if other is not None and (best is None or other[0] > best[0] or other[1] < best[1]):
+            best = other
+    return index.fuzzy_items[best[1]] if best else None
+
+
+def _fuzzy_pick(
+    index: _ItemIndex, query: str, positions: Optional[List[int]], floor: Optional[float] = None
+) -> Optional[Tuple[float, int]]:
+    """(score, position) of the best fuzzy key among `positions` (all keys when None).
+
+    Only keys scoring 80+ and at least `floor` count; the first best key wins.
+    """
+    if positions is None:
+        fuzzy_keys = index.fuzzy_keys
+        positions = range(len(fuzzy_keys))
+    else:
+        all_keys = index.fuzzy_keys
+        fuzzy_keys = [all_keys[pos] for pos in positions]
+    if rf_process is not None:
+        # Same WRatio scorer and preprocessing as fuzzywuzzy; returns (key, score, idx) or None
+        match = rf_process.extractOne(
+            query,
+            fuzzy_keys,
+            scorer=fuzz.WRatio,
+            processor=rf_utils.default_process,
+            score_cutoff=max(80, floor) if floor is not None else 80,
+        )
+        return (match[1], positions[match[2]]) if match else None
+
+    # difflib fallback: ratio() is 0..1, compared against the same 80 cutoff
+    best_idx = -1
+    best_score = -1.0
+    if floor is None:
+        floor = -1.0
+    matcher = difflib.SequenceMatcher(a=query)
+    for idx, key in enumerate(fuzzy_keys):
+        matcher.set_seq2(key)
+        # Cheap upper bounds first: skip keys that cannot beat the best so far, the floor or 80
+        bound = matcher.real_quick_ratio()
+        if bound <= best_score or bound < floor or int(round(bound * 100)) < 80:
+            continue
+        bound = matcher.quick_ratio()
+        if bound <= best_score or bound < floor or int(round(bound * 100)) < 80:
+            continue
+        score = matcher.ratio()
+        if score > best_score and score >= floor:
+            best_score = score
+            best_idx = idx
+    if best_idx >= 0 and int(round(best_score * 100)) >= 80:
+        return best_score, positions[best_idx]
+    return None
 
 
 def format_price_response(item: Dict[str, Any]) -> str:
     """Format the price response string with both PvP and PvE prices"""
-    # Parse timestamps and keep them timezone-aware
-    pvp_dt = datetime.fromisoformat(item["updated"].replace("Z", "+00:00"))
-    current_dt = datetime.now(tz.utc)
+    # Stamps are parsed once per payload by _build_item_index; parse here only for unindexed items
+    now_ts = time.time()
+    pvp_ts = item["_updated_ts"] if "_updated_ts" in item else _iso_ts(item.get("updated"))
+    pvp_mins = int((now_ts - pvp_ts) / 60) if pvp_ts is not None else None
 
     # Check if both PvE fields exist in the item
     if "pveUpdated" in item and "pvePrice" in item:
-        pve_dt = datetime.fromisoformat(item["pveUpdated"].replace("Z", "+00:00"))
-        pve_mins = int((current_dt - pve_dt).total_seconds() / 60)
+        pve_ts = item["_pve_updated_ts"] if "_pve_updated_ts" in item else _iso_ts(item["pveUpdated"])
+        pve_mins = int((now_ts - pve_ts) / 60) if pve_ts is not None else None
         pve_price = "{:,}".format(item["pvePrice"])
     else:
         pve_mins = None
         pve_price = "N/A"
 
-    pvp_mins = int((current_dt - pvp_dt).total_seconds() / 60)
-
-    # Format time strings
-    def format_time(mins: Optional[int]) -> str:
-        if mins is None:
-            return "N/A"
-        hours = mins // 60
-        minutes = mins % 60
-        return f"{hours}h{minutes}m" if hours > 0 else f"{minutes}m"
-
     # Format prices with commas
     pvp_val = item.get("price")
     pvp_price = "{:,}".format(pvp_val) if isinstance(pvp_val, int) else "N/A"
@@ -299,4 +555,103 @@ def format_price_response(item: Dict[str, Any]) -> str:
     trader_price = "{:,}".format(trader_val) if isinstance(trader_val, int) else "N/A"
     trader_info = f" | Trader: {trader_price}₽ {item.get('traderSellName', 'N/A')}"
 
-    return f"💰 {item['name']} | PvP: {pvp_price}₽ ({format_time(pvp_mins)} ago) | PvE: {pve_price}₽ ({format_time(pve_mins)} ago){trader_info}"
+    return f"💰 {item['name']} | PvP: {pvp_price}₽ ({_fmt_mins(pvp_mins)} ago) | PvE: {pve_price}₽ ({_fmt_mins(pve_mins)} ago){trader_info}"
+
+
+# Rouble amount formatting shared by every embed field
+def _fmt_int(n: int) -> str:
+    # Values under four digits have no separators to insert
+    return str(n) if -1000 < n < 1000 else f"{n:,}"
+
+
+def format_roubles(n: int) -> str:
+    return _fmt_int(n) + "₽"
+
+
+def format_roubles_bold(n: int) -> str:
+    return "**" + _fmt_int(n) + "₽**"
+
+
+@functools.lru_cache(maxsize=1024)
+def _fmt_mins(mins: Optional[int]) -> str:
+    """Render an age in minutes as "XhYm" / "Ym", or "N/A" when unknown."""
+    if mins is None:
+        return "N/A"
+    hours, minutes = divmod(mins, 60)
+    return f"{hours}h{minutes}m" if hours > 0 else f"{minutes}m"
+
+
+def build_price_embed(
+    item: Dict[str, Any], selected_mode: str, now_ts: Optional[float] = None
+) -> discord.Embed:
+    """Build the /price embed for an item returned by find_item.
+
+    `selected_mode` is "pvp" or "pve"; `now_ts` (epoch seconds) defaults to now.
+    """
+    # Update stamps are parsed to epoch seconds once per payload by the item index
+    if now_ts is None:
+        now_ts = time.time()
+    updated_ts = item.get("_pve_updated_ts") if selected_mode == "pve" else item.get("_updated_ts")
+    last_mins: Optional[int] = None
+    if updated_ts is not None:
+        last_mins = int((now_ts - updated_ts) / 60)
+
+    # Fields are collected as dicts and the embed is built once from them
+    fields: List[Dict[str, Any]] = []
+
+    # Primary price block (two-column inline fields)
+    # Only show Flea when the selected mode actually has a flea price.
+    flea_price_raw = item.get('pvePrice') if selected_mode == 'pve' else item.get('price')
+    if flea_price_raw is not None:
+        fields.append({"name": "Flea Market Price", "value": format_roubles_bold(flea_price_raw), "inline": True})
+
+    trader_price = item.get('traderSellPrice')
+    if trader_price is not None:
+        fields.append({"name": "Trader Buying Price", "value": format_roubles_bold(trader_price), "inline": True})
+
+    # Price per slot (based on selected mode flea price)
+    slots = item.get('_slots')
+    # Use selected mode flea for PPS; in PvP, if missing, fallback to trader price just for PPS.
+    pps_price = flea_price_raw
+    if pps_price is None and selected_mode == 'pvp':
+        tf = item.get('traderSellPrice')
+        if isinstance(tf, int):
+            pps_price = tf
+    if pps_price is not None and slots and slots > 0:
+        pps = int(round(pps_price / slots))
+        fields.append({"name": "Price Per Slot", "value": format_roubles(pps), "inline": True})
+
+    # Highlighted Base Price (yellow accent via emoji)
+    base_price = item.get('basePrice')
+    if base_price is not None:
+        fields.append({"name": "🟡 Base Price", "value": format_roubles_bold(base_price), "inline": True})
+
+    # Secondary block
+    avg_24h = item.get('avg24hPrice')
+    if isinstance(avg_24h, int):
+        fields.append({"name": "24 Hour Price AVG", "value": format_roubles(avg_24h), "inline": True})
+
+    trader_name = item.get('traderSellName') or "Unknown Trader"
+    fields.append({"name": "Trader to sell to", "value": trader_name, "inline": True})
+
+    # Footer: last updated and attribution (fallback to other mode if missing)
+    if last_mins is None:
+        fallback_ts = item.get('_updated_ts') if selected_mode == 'pve' else item.get('_pve_updated_ts')
+        if fallback_ts is not None:
+            last_mins = int((now_ts - fallback_ts) / 60)
+    updated_str = f"Last Updated: {_fmt_mins(last_mins)} ago" if last_mins is not None else "Last Updated: N/A"
+
+    # Header (title + link + thumbnail), fields and footer in one pass
+    embed_data: Dict[str, Any] = {
+        "title": item["name"],
+        "color": 0x2b2d31,
+        "fields": fields,
+        "footer": {"text": f"{updated_str} - Data provided by Tarkov.dev"},
+    }
+    link = item.get("link")
+    if link:
+        embed_data["url"] = link
+    thumb = item.get("gridImageLink")
+    if thumb:
+        embed_data["thumbnail"] = {"url": thumb}
+    return discord.Embed.from_dict(embed_data)